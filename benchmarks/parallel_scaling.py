@@ -0,0 +1,64 @@
+"""
+Measures how the parallel searches of easyAI scale with the number of
+workers: ParallelNegamax (root splitting) and YBWC on the opening of Connect
+Four, and LazySMP on the opening of Knights (which has a ``ttentry``
+method). Each search is measured with worker processes, then with worker
+threads (``threads=True``), which only run in parallel on a free-threaded
+build of Python (e.g. ``python3.13t``).
+
+Usage: python benchmarks/parallel_scaling.py [max_workers] [depth]
+"""
+
+import os
+import sys
+import time
+
+from easyAI import AI_Player, LazySMP, Negamax, ParallelNegamax, YBWC
+from easyAI.games import ConnectFour, Knights
+
+
+def time_search(ai_algo, game_class):
+    game = game_class([AI_Player(ai_algo), AI_Player(ai_algo)])
+    start = time.perf_counter()
+    move = ai_algo(game)
+    return move, time.perf_counter() - start
+
+
+def benchmark(parallel_class, game_class, depth, max_workers, threads=False):
+    move, reference = time_search(Negamax(depth), game_class)
+    print(
+        "\n%s (%s) on %s, Negamax(%d): move %s in %.2fs"
+        % (
+            parallel_class.__name__,
+            "threads" if threads else "processes",
+            game_class.__name__,
+            depth,
+            move,
+            reference,
+        )
+    )
+    print("workers    time  speedup    nodes  (speedup relative to 1 worker)")
+    for workers in range(1, max_workers + 1):
+        ai_algo = parallel_class(depth, workers=workers, threads=threads)
+        time_search(ai_algo, game_class)  # starts the worker processes
+        if parallel_class is LazySMP:
+            ai_algo.tt.clear()
+        move, duration = time_search(ai_algo, game_class)
+        ai_algo.close()
+        if workers == 1:
+            reference = duration
+        print(
+            "%7d %6.2fs %7.2fx %8d  (move %s)"
+            % (workers, duration, reference / duration, ai_algo.nodes, move)
+        )
+
+
+if __name__ == "__main__":
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("Python %s, GIL %s" % (sys.version.split()[0], "on" if gil else "off"))
+    for threads in [False, True]:
+        benchmark(ParallelNegamax, ConnectFour, depth, max_workers, threads)
+        benchmark(YBWC, ConnectFour, depth, max_workers, threads)
+        benchmark(LazySMP, Knights, depth + 2, max_workers, threads)
@@ -0,0 +1,244 @@
+"""
+This module implements a compact transposition table stored in a NumPy
+array, for tables of millions of entries.
+"""
+
+import numpy as np
+
+from .Negamax import EXACT
+from .SharedTranspositionTable import (
+    ENTRY_DTYPE,
+    MASK64,
+    hash64,
+    index_to_move,
+    move_to_index,
+)
+from .TranspositionTable import position_key
+
+GENERATION_BITS = 8
+GENERATION_MASK = 2**GENERATION_BITS - 1
+POSITION_MASK = MASK64 ^ GENERATION_MASK
+
+
+class ArrayTranspositionTable:
+    """
+    A transposition table of fixed size made of a preallocated NumPy
+    structured array, using 16 bytes per entry (a Python dictionary of
+    dictionaries uses hundreds of bytes per entry). Storing an entry creates
+    no Python objects, so tables of millions of entries (e.g. for solving a
+    game) stay small and fast to fill.
+
+    Each position is identified by a 64-bit hash of its ``game.ttentry()``
+    (or its Zobrist key ``game.zobrist``), and stored in the first free slot
+    among ``probes`` consecutive slots starting at a slot given by the key
+    (open addressing). When these slots are all used by other positions, the
+    entry replaces the oldest one (see ``TranspositionTable.generation``),
+    or among entries of the current search the one searched the least deep.
+    The generation of an entry is stored in the last 8 bits of its key, the
+    other 56 bits identify the position. The generation of the table is
+    stored in an extra record after the entries, so that it is saved with
+    them.
+
+    An entry holds the score (as a 32-bit float), the depth, the flag and the
+    index of the best move (see ``move_to_index``), like the entries of
+    ``Negamax`` and of the solving functions (``solve_with_depth_first_search``)
+    but not those of ``SSS`` and ``DUAL``.
+
+    The table can be saved to a ``.npy`` file (a header followed by the
+    entries and the generation record), and opened again either in memory or
+    mapped in memory (``numpy.memmap``): opening a mapped table is
+    instantaneous, and only the parts of the file which are looked up are
+    read from the disk, so the table can be larger than the RAM. A table can
+    also be created directly in a mapped file, with ``filename``.
+
+    Usage:
+
+        >>> table = ArrayTranspositionTable(2**24)  # 256Mo
+        >>> ai = Negamax(12, scoring, tt=table)
+        >>> ai(some_game)
+        >>> table.to_file("table.npy")
+
+        >>> # later (or in a different program)...
+        >>> table = ArrayTranspositionTable()
+        >>> table.from_file("table.npy", mmap_mode="r")
+
+    A table mapped read-only (``mmap_mode="r"``) ignores the entries that
+    the AI stores. When it is pickled (e.g. sent to worker processes) only
+    its file name is sent, and all processes share the same pages of memory.
+    A table mapped with ``mmap_mode="r+"`` is shared in the same way, but
+    its entries should not be stored by several processes at a time (see
+    ``SharedTranspositionTable``).
+
+    Parameters
+    -----------
+
+    size:
+      Number of entries of the table (16 bytes each).
+
+    probes:
+      Number of slots where an entry can be stored. A table must be used
+      with the same value as when it was filled.
+
+    filename:
+      If provided, the table is created in this ``.npy`` file, mapped in
+      memory, instead of in the RAM. Its entries are written to the disk by
+      ``flush()``, or when the table is deleted.
+    """
+
+    def __init__(self, size=2**20, probes=4, filename=None):
+        self.probes = probes
+        # The entries, then a record with the generation of the table.
+        if filename is None:
+            array = np.zeros(size + 1, dtype=ENTRY_DTYPE)
+        else:
+            array = np.lib.format.open_memmap(
+                filename, mode="w+", dtype=ENTRY_DTYPE, shape=(size + 1,)
+            )
+        self.set_array(array, filename, "r+")
+
+    def set_array(self, array, filename=None, mmap_mode=None):
+        """Makes the table use an array of entries followed by the generation
+        record (mapped in memory from ``filename`` with ``mmap_mode``, if
+        provided)."""
+        self.array = array
+        self.entries = array[:-1]
+        self.keys = self.entries["key"]
+        self.size = len(self.entries)
+        self.generation = int(array["key"][-1])
+        self.offsets = np.arange(self.probes)
+        self.filename = filename
+        self.mmap_mode = mmap_mode if (filename is not None) else None
+
+    def __getstate__(self):
+        if self.filename is None:
+            return {"array": self.array, "probes": self.probes}
+        # A mapped table is sent by name, to be mapped again.
+        self.flush()
+        return {
+            "filename": self.filename,
+            "mmap_mode": self.mmap_mode,
+            "probes": self.probes,
+        }
+
+    def __setstate__(self, state):
+        self.probes = state["probes"]
+        if state.get("filename") is None:
+            self.set_array(state["array"])
+        else:
+            self.from_file(state["filename"], state["mmap_mode"])
+
+    def __len__(self):
+        return int(np.count_nonzero(self.keys))
+
+    def key(self, game):
+        """Returns the 64-bit key of the game, with its last bits (where the
+        generation of an entry goes) set to 0. A key is never 0, which means
+        an empty slot."""
+        key = hash64(position_key(game)) & POSITION_MASK
+        return key or (GENERATION_MASK + 1)
+
+    def ages(self, keys):
+        """Returns the numbers of generations since the entries of the given
+        keys were stored (modulo 256)."""
+        generations = (keys & np.uint64(GENERATION_MASK)).astype(int)
+        return (self.generation - generations) & GENERATION_MASK
+
+    def find(self, key):
+        """Returns the index of the slot of ``key``, or -1 if it is not in the
+        table, and the index of the slot where it would be stored."""
+        # The last bits of the keys are 0 (see ``key``), the others give the
+        # first slot.
+        slots = ((key >> GENERATION_BITS) % self.size + self.offsets) % self.size
+        window = self.keys[slots]
+        found = np.flatnonzero((window & np.uint64(POSITION_MASK)) == key)
+        if len(found):
+            return slots[found[0]], slots[found[0]]
+        free = np.flatnonzero(window == 0)
+        if len(free):
+            return -1, slots[free[0]]
+        # The oldest entry is replaced, else the least deep one.
+        depths = self.entries["depth"][slots].astype(int)
+        return -1, slots[np.argmin(depths - 256 * self.ages(window))]
+
+    def lookup(self, game):
+        """Requests the entry in the table. Returns None if the
+        entry has not been previously stored in the table."""
+        index, _ = self.find(self.key(game))
+        if index < 0:
+            return None
+        _, value, depth, flag, move_index = self.entries[index].item()
+        move = None
+        if move_index >= 0:
+            move = index_to_move(game, move_index)
+            if move is None:
+                return None
+        return {"value": value, "depth": depth, "flag": flag, "move": move}
+
+    def __call__(self, game):
+        """Returns the move stored for this game (see
+        ``TranspositionTable.__call__``)."""
+        entry = self.lookup(game)
+        if entry is None:
+            raise KeyError(position_key(game))
+        return entry["move"]
+
+    def store(self, **data):
+        """Stores an entry into the table. The data must contain the
+        ``game``, ``value`` and ``move`` (which may be None), and can contain
+        the ``depth`` (by default 0) and ``flag`` (by default EXACT). Tables
+        mapped read-only ignore the entry."""
+        if self.mmap_mode == "r":
+            return
+        game, move = data["game"], data["move"]
+        key = self.key(game)
+        move_index = -1 if (move is None) else move_to_index(game, move)
+        depth = min(max(data.get("depth", 0), -128), 127)
+        _, index = self.find(key)
+        self.entries[index] = (
+            key | (self.generation & GENERATION_MASK),
+            data["value"],
+            depth,
+            data.get("flag", EXACT),
+            move_index,
+        )
+
+    def clear(self):
+        """Removes all the entries of the table."""
+        self.entries[:] = 0
+
+    def new_search(self):
+        """Starts a new generation of entries. This is called by the AIs at
+        the start of each search."""
+        self.generation += 1
+        if self.mmap_mode != "r":
+            self.array["key"][-1] = self.generation
+
+    def prune_older_than(self, generation):
+        """Removes the entries stored before the given generation (if it is
+        one of the last 256 generations). Tables mapped read-only are not
+        modified."""
+        if self.mmap_mode == "r":
+            return
+        old = (self.keys != 0) & (self.ages(self.keys) > self.generation - generation)
+        self.entries[old] = 0
+
+    def flush(self):
+        """Writes the changes of a table mapped in memory to its file."""
+        if self.mmap_mode in ("r+", "w+"):
+            self.array.flush()
+
+    def to_file(self, filename):
+        """Saves the table to a ``.npy`` file."""
+        np.save(filename, self.array)
+
+    def from_file(self, filename, mmap_mode=None):
+        """
+        Loads a table previously saved with ``ArrayTranspositionTable.to_file``
+        (or created with a ``filename``), replacing the entries of this table.
+
+        With ``mmap_mode="r"`` (read-only) or ``"r+"`` (read-write), the file
+        is mapped in memory instead of being read: its parts are read from the
+        disk when they are needed.
+        """
+        array = np.load(filename, mmap_mode=mmap_mode)
+        self.set_array(array, filename if mmap_mode else None, mmap_mode)
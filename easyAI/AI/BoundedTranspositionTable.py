@@ -0,0 +1,154 @@
+"""
+This module implements a transposition table of bounded size, which
+replaces old entries when it is full.
+"""
+
+from .TranspositionTable import TranspositionTable, position_key
+
+POLICIES = ("always", "depth", "two-tier")
+
+
+class BoundedTranspositionTable(TranspositionTable):
+    """
+    A transposition table which holds at most ``size`` entries, so that its
+    memory stays bounded however long the AI plays. It is used like a
+    ``TranspositionTable`` (by ``Negamax``, ``SSS``...) and can be saved to
+    files in the same way.
+
+    Each position has a fixed place in the table, given by the hash of its
+    ``game.ttentry()`` (or of its Zobrist key ``game.zobrist``). When
+    another position already has this place, the replacement policy decides
+    which entry is kept:
+
+    - ``"always"``: the new entry always replaces the old one (recent
+      entries are the most likely to be useful again).
+    - ``"depth"``: the new entry only replaces an entry of another position
+      if it was searched as deep or deeper (deep entries saved more work),
+      or if this entry was stored by a previous search (see ``generation``).
+    - ``"two-tier"``: each place has two slots, a depth-preferred slot and
+      an always-replace slot. A new entry goes to the first slot if it would
+      replace the entry there with the ``"depth"`` policy, and this entry
+      then moves to the second slot; else the new entry goes to the second
+      slot.
+
+    Usage:
+
+        >>> table = BoundedTranspositionTable(2**20, policy="two-tier")
+        >>> ai = Negamax(8, scoring, tt=table)
+
+    Parameters
+    -----------
+
+    size:
+      Maximal number of entries of the table.
+
+    policy:
+      Replacement policy: ``"always"``, ``"depth"`` or ``"two-tier"``.
+      Entries without a depth (e.g. those of the solving functions) have a
+      depth of 0.
+    """
+
+    def __init__(self, size=2**20, policy="two-tier"):
+        if policy not in POLICIES:
+            raise ValueError("policy should be one of %s." % ", ".join(POLICIES))
+        self.size = size
+        self.policy = policy
+        self.ways = 2 if (policy == "two-tier") else 1
+        if size < self.ways:
+            raise ValueError("size should be at least %d." % self.ways)
+        self.generation = 0
+        self.clear()
+
+    def clear(self):
+        """Removes all the entries of the table."""
+        # One (position key, data) tuple or None per slot.
+        self.slots = [None] * self.size
+
+    def __len__(self):
+        return sum(slot is not None for slot in self.slots)
+
+    @property
+    def d(self):
+        """The entries of the table, as a dictionary {position key: data}.
+        Setting this dictionary replaces the entries of the table."""
+        return dict(slot for slot in self.slots if slot is not None)
+
+    @d.setter
+    def d(self, entries):
+        self.clear()
+        for entry, data in entries.items():
+            self.put(entry, data)
+
+    def __getstate__(self):
+        # The places of the entries depend on ``hash``, which can change from
+        # one Python process to the next, so the entries are placed again
+        # when the table is unpickled.
+        return {
+            "size": self.size,
+            "policy": self.policy,
+            "generation": self.generation,
+            "entries": self.d,
+        }
+
+    def __setstate__(self, state):
+        self.__init__(state["size"], state["policy"])
+        self.generation = state.get("generation", 0)
+        self.d = state["entries"]
+
+    def prune_older_than(self, generation):
+        """Removes the entries stored before the given generation."""
+        for index, slot in enumerate(self.slots):
+            if (slot is not None) and (slot[1].get("generation", 0) < generation):
+                self.slots[index] = None
+
+    def place(self, entry):
+        """Returns the index of the (first) slot of a position key."""
+        return self.ways * (hash(entry) % (self.size // self.ways))
+
+    def lookup(self, game):
+        """Requests the entry in the table. Returns None if the
+        entry is not in the table."""
+        entry = position_key(game)
+        index = self.place(entry)
+        for slot in self.slots[index : index + self.ways]:
+            if (slot is not None) and (slot[0] == entry):
+                return slot[1]
+        return None
+
+    def __call__(self, game):
+        """Returns the move stored for this game (see
+        ``TranspositionTable.__call__``)."""
+        entry = self.lookup(game)
+        if entry is None:
+            raise KeyError(position_key(game))
+        return entry["move"]
+
+    def store(self, **data):
+        """Stores an entry into the table, if the replacement policy allows
+        it."""
+        entry = position_key(data.pop("game"))
+        data["generation"] = self.generation
+        self.put(entry, data)
+
+    def put(self, entry, data):
+        """Stores the data of a position key (see ``position_key``) according
+        to the replacement policy."""
+        index = self.place(entry)
+        old = self.slots[index]
+        if self.policy == "always":
+            self.slots[index] = (entry, data)
+        elif (
+            (old is None)
+            or (old[0] == entry)
+            or (old[1].get("generation", 0) < self.generation)
+            or (data.get("depth", 0) >= old[1].get("depth", 0))
+        ):
+            self.slots[index] = (entry, data)
+            if self.policy == "two-tier":
+                second = self.slots[index + 1]
+                if (old is not None) and (old[0] != entry):
+                    self.slots[index + 1] = old
+                elif (second is not None) and (second[0] == entry):
+                    self.slots[index + 1] = None
+        elif self.policy == "two-tier":
+            self.slots[index + 1] = (entry, data)
@@ -0,0 +1,107 @@
+from .Negamax import Negamax, inf
+from .ParallelNegamax import ParallelNegamax
+from .SharedTranspositionTable import SharedTranspositionTable
+from .parallel import game_for_worker, helper_search
+
+
+class LazySMP(ParallelNegamax):
+    """
+    Lazy SMP parallel search: while the current process searches the game
+    with Negamax, helper processes search the same game at the same depth or
+    one move deeper, starting with different root moves. All processes share
+    one transposition table in shared memory (a ``SharedTranspositionTable``),
+    so the helpers fill it with results which speed up the main search. The
+    result (``game.ai_move``, ``self.alpha``...) is the one of the main
+    search, and the helpers are stopped when it ends.
+
+        >>> from easyAI.games import Knights
+        >>> from easyAI import LazySMP, Human_Player, AI_Player
+        >>> ai_algo = LazySMP(max_time=5, workers=8) # iterative deepening
+        >>> game = Knights([Human_Player(), AI_Player(ai_algo)])
+        >>> game.play()
+        >>> ai_algo.close() # stops the helpers, frees the table
+
+    The game must have a ``ttentry`` method and be picklable, as well as the
+    ``scoring`` and ``ordering`` functions (see ``ParallelNegamax``), unless
+    the helpers are threads (``threads=True``). The number of nodes in
+    ``self.nodes`` includes the nodes of the helpers.
+
+    Parameters
+    -----------
+
+    depth, scoring, win_score, max_time, threads, ...:
+      Same as for ``ParallelNegamax``.
+
+    tt:
+      A ``SharedTranspositionTable`` (or, with ``threads=True``, a
+      ``TranspositionTable``). If not provided, a ``SharedTranspositionTable``
+      of ``tt_size`` entries is created, and freed by ``close()``.
+
+    workers:
+      Total number of searching processes (the current process and
+      ``workers - 1`` helpers), by default the number of CPUs.
+
+    tt_size:
+      Number of entries of the table created when ``tt`` is not provided.
+    """
+
+    def __init__(
+        self,
+        depth=None,
+        scoring=None,
+        win_score=+inf,
+        tt=None,
+        workers=None,
+        tt_size=2**20,
+        **kw,
+    ):
+        self.own_tt = tt is None
+        if self.own_tt:
+            tt = SharedTranspositionTable(tt_size)
+        ParallelNegamax.__init__(self, depth, scoring, win_score, tt, workers, **kw)
+
+    def close(self):
+        """Stops the helper processes and frees the transposition table if it
+        was created by this AI (which can then not be used anymore)."""
+        ParallelNegamax.close(self)
+        if self.own_tt and (self.tt is not None):
+            self.tt.close()
+            self.tt = None
+
+    def root_search(
+        self, game, depth, scoring, alpha, beta, abort=None, stats=None, pv=None
+    ):
+        """
+        Searches the game at the given depth with the window (alpha, beta)
+        while the helpers search it too. Sets ``game.ai_move`` and returns
+        the score.
+        """
+        if (self.workers < 2) or (depth < 2) or game.is_over():
+            return Negamax.root_search(
+                self, game, depth, scoring, alpha, beta, abort, stats, pv
+            )
+        if self.pool is None:
+            self.pool = self.start_pool(self.workers - 1)
+        worker_game, options = game_for_worker(game), self.search_options()
+        helpers = [
+            self.pool.submit(
+                helper_search,
+                self.pool.task_game(worker_game),
+                depth + (i % 2),
+                i + 1,
+                self.scoring,
+                options,
+            )
+            for i in range(self.workers - 1)
+        ]
+        try:
+            return Negamax.root_search(
+                self, game, depth, scoring, alpha, beta, abort, stats, pv
+            )
+        finally:
+            self.pool.abort()
+            for helper in helpers:
+                nodes = helper.result()
+                if stats is not None:
+                    stats["nodes"] += nodes
+            self.pool.reset()
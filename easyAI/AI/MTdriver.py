@@ -1,20 +1,42 @@
 # contributed by mrfesol (Tomasz Wesolowski)
 
+from .MoveOrdering import generate_moves
+
 inf = 1000000
 eps = 0.001
 
 
-def mt(game, gamma, depth, origDepth, scoring, tt=None):
+def mt(
+    game,
+    gamma,
+    depth,
+    origDepth,
+    scoring,
+    tt=None,
+    move_history=None,
+    ordering=None,
+    pv=None,
+    stats=None,
+):
     """
     This implements Memory-Enhanced Test with transposition tables.
     This method is not meant to be used directly.
     This implementation is inspired by paper:
     http://arxiv.org/ftp/arxiv/papers/1404/1404.1515.pdf
+
+    If ``pv`` is a list, it is filled with the best line of play found from
+    this position (it may be truncated by transposition table hits).
+    The positions searched are counted in ``stats["nodes"]`` if ``stats`` is
+    a dict.
     """
 
+    if stats is not None:
+        stats["nodes"] += 1
+    if pv is not None:
+        pv.clear()
+
     # Is there a transposition table and is this game in it ?
     lookup = None if (tt is None) else tt.lookup(game)
-    possible_moves = None
     lowerbound, upperbound = -inf, inf
     best_move = None
 
@@ -42,15 +64,15 @@ def mt(game, gamma, depth, origDepth, scoring, tt=None):
     else:
         ngame = game
         unmake_move = hasattr(game, "unmake_move")
-        possible_moves = game.possible_moves()
-        best_move = possible_moves[0]
+        possible_moves = generate_moves(
+            game, ordering, move_history, origDepth - depth
+        )
 
-        if not hasattr(game, "ai_move"):
-            game.ai_move = best_move
-
-        for move in possible_moves:
-            if best_value >= gamma:
-                break
+        for i, move in enumerate(possible_moves):
+            if i == 0:
+                best_move = move
+                if not hasattr(game, "ai_move"):
+                    game.ai_move = best_move
 
             if not unmake_move:
                 ngame = game.copy()
@@ -58,26 +80,44 @@ def mt(game, gamma, depth, origDepth, scoring, tt=None):
             ngame.make_move(move)
             ngame.switch_player()
 
-            move_value = -mt(ngame, -gamma, depth - 1, origDepth, scoring, tt)
+            child_pv = None if (pv is None) else []
+            move_value = -mt(
+                ngame,
+                -gamma,
+                depth - 1,
+                origDepth,
+                scoring,
+                tt,
+                move_history,
+                ordering,
+                child_pv,
+                stats,
+            )
             if best_value < move_value:
                 best_value = move_value
                 best_move = move
+                if pv is not None:
+                    pv[:] = [move] + child_pv
 
             if unmake_move:
                 ngame.switch_player()
                 ngame.unmake_move(move)
 
+            if best_value >= gamma:
+                break
+
         if best_value < gamma:
             upperbound = best_value
         else:
             if depth == origDepth:
                 game.ai_move = best_move
             lowerbound = best_value
+            if move_history is not None:
+                move_history.record_cutoff(best_move, origDepth - depth, depth)
 
     if tt is not None:
 
         if depth > 0 and not game.is_over():
-            assert best_move in possible_moves
             tt.store(
                 game=game,
                 lowerbound=lowerbound,
@@ -89,23 +129,53 @@ def mt(game, gamma, depth, origDepth, scoring, tt=None):
     return best_value
 
 
-def mtd(game, first, next, depth, scoring, tt=None):
+def mtd(
+    game,
+    first,
+    next,
+    depth,
+    scoring,
+    tt=None,
+    move_history=None,
+    ordering=None,
+    pv=None,
+    stats=None,
+):
     """
     This implements Memory-Enhanced Test Driver.
     This method is not meant to be used directly.
     It's used by several algorithms from MT family, i.e see ``easyAI.SSS``
     For more details read following paper:
     http://arxiv.org/ftp/arxiv/papers/1404/1404.1515.pdf
+
+    If ``pv`` is a list, it is filled with the line found by the last test
+    which raised the lower bound (the one which also sets ``game.ai_move``).
+    The positions searched by all the tests are counted in ``stats["nodes"]``
+    if ``stats`` is a dict.
     """
     bound, best_value = first, first
     lowerbound, upperbound = -inf, inf
     while True:
         bound = next(lowerbound, upperbound, best_value)
-        best_value = mt(game, bound - eps, depth, depth, scoring, tt)
+        line = None if (pv is None) else []
+        best_value = mt(
+            game,
+            bound - eps,
+            depth,
+            depth,
+            scoring,
+            tt,
+            move_history,
+            ordering,
+            line,
+            stats,
+        )
         if best_value < bound:
             upperbound = best_value
         else:
             lowerbound = best_value
+            if pv is not None:
+                pv[:] = line
         if lowerbound == upperbound:
             break
     return best_value
\ No newline at end of file
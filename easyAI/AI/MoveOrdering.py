@@ -0,0 +1,139 @@
+"""
+This module implements move-ordering heuristics, which make the AI explore
+the most promising moves first so that alpha-beta pruning cuts more branches.
+"""
+
+
+def order_moves(game, moves, ordering=None):
+    """
+    Returns the moves in the order in which they should be explored, using
+    the ``ordering(game, moves)`` function if provided, else the optional
+    ``game.order_moves(moves)`` method of the game. This is called at every
+    node of the search, so it should be fast.
+    """
+    if ordering is not None:
+        return ordering(game, moves)
+    if hasattr(game, "order_moves"):
+        return game.order_moves(moves)
+    return moves
+
+
+def generate_moves(game, ordering=None, move_history=None, ply=0, first_move=None):
+    """
+    Returns the moves of the game in the order in which the search should
+    explore them, starting with ``first_move`` (e.g. the move of the
+    transposition table) if provided.
+
+    If the game has an ``iter_moves()`` method yielding its moves lazily,
+    best moves first (e.g. captures, then the rest), and no ``ordering`` or
+    ``move_history`` requires the full list of moves, a generator is
+    returned: the moves after a beta-cutoff are then never generated.
+    """
+    if hasattr(game, "iter_moves"):
+        if (ordering is None) and (move_history is None):
+            return staged_moves(game, first_move)
+        moves = list(game.iter_moves())
+    else:
+        moves = game.possible_moves()
+    moves = order_moves(game, moves, ordering)
+    if move_history is not None:
+        moves = move_history.sort(moves, ply)
+    if first_move is not None:
+        moves.remove(first_move)
+        moves = [first_move] + moves
+    return moves
+
+
+def staged_moves(game, first_move=None):
+    """Yields ``first_move`` then the other moves of ``game.iter_moves()``.
+    The game's generator only starts once the first move has been searched,
+    so it is never run if this first move produces a cutoff."""
+    if first_move is not None:
+        yield first_move
+    for move in game.iter_moves():
+        if move != first_move:
+            yield move
+
+
+def move_key(move):
+    """Returns a hashable version of a move (moves can be lists)."""
+    try:
+        hash(move)
+        return move
+    except TypeError:
+        return repr(move)
+
+
+class MoveHistory:
+    """
+    Killer moves and history heuristic, learned from the beta-cutoffs of the
+    search.
+
+    - The killer moves of a ply are the last moves which produced a cutoff
+      at that ply (distance from the root). Since sibling positions are
+      often similar, these moves are tried first.
+    - The history table gives each move a score which increases every time
+      the move produces a cutoff (by ``depth**2``, so that cutoffs close to
+      the root count more). The other moves are tried by decreasing score.
+
+    Usage:
+
+        >>> history = MoveHistory()
+        >>> ai = Negamax(8, scoring, move_history=history)
+
+    The same ``MoveHistory`` can be used by ``Negamax``, ``PVS``,
+    ``NonRecursiveNegamax``, ``SSS`` and ``DUAL``. It is kept from one move
+    to the next: call ``clear()`` to start afresh.
+
+    Parameters
+    -----------
+
+    killers:
+      Number of killer moves remembered per ply (0 to disable killer moves).
+
+    history:
+      Whether to use the history heuristic.
+    """
+
+    def __init__(self, killers=2, history=True):
+        self.n_killers = killers
+        self.use_history = history
+        self.clear()
+
+    def clear(self):
+        """Forgets all killer moves and the history table."""
+        self.killers = {}
+        self.history = {}
+
+    def sort(self, moves, ply):
+        """Returns the moves sorted with the killer moves of this ply first,
+        then by decreasing history score (the order of equal moves is kept)."""
+        killers = self.killers.get(ply, [])
+        history = self.history
+        if not (killers or history):
+            return moves
+
+        def rank(move):
+            key = move_key(move)
+            if key in killers:
+                return (0, killers.index(key))
+            return (1, -history.get(key, 0))
+
+        return sorted(moves, key=rank)
+
+    def is_killer(self, move, ply):
+        """Returns True if the move is one of the killer moves of the ply."""
+        return move_key(move) in self.killers.get(ply, ())
+
+    def record_cutoff(self, move, ply, depth):
+        """Records that ``move`` produced a cutoff at the given ply, with
+        ``depth`` moves left to search."""
+        key = move_key(move)
+        if self.n_killers:
+            killers = self.killers.setdefault(ply, [])
+            if key in killers:
+                killers.remove(key)
+            killers.insert(0, key)
+            del killers[self.n_killers :]
+        if self.use_history:
+            self.history[key] = self.history.get(key, 0) + depth * depth
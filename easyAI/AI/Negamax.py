@@ -3,21 +3,190 @@ The standard AI algorithm of easyAI is Negamax with alpha-beta pruning
 and (optionnally), transposition tables.
 """
 
+import math
 import pickle
+import time
+
+from .MoveOrdering import generate_moves
+from .SearchResult import SearchResult, search_copy
 
 LOWERBOUND, EXACT, UPPERBOUND = -1, 0, 1
 inf = float("infinity")
 
 
-def negamax(game, depth, origDepth, scoring, alpha=+inf, beta=-inf, tt=None):
+class SearchAborted(Exception):
+    """Raised inside a search when its ``abort`` callback returns True."""
+
+
+def make_null_move(game):
+    """Passes the turn, using the optional ``game.make_null_move()``."""
+    if hasattr(game, "make_null_move"):
+        game.make_null_move()
+    game.switch_player()
+
+
+def unmake_null_move(game):
+    """Cancels ``make_null_move``, using the optional
+    ``game.unmake_null_move()``."""
+    game.switch_player()
+    if hasattr(game, "unmake_null_move"):
+        game.unmake_null_move()
+
+
+def is_quiet_test(game):
+    """
+    Returns a function f(move) -> bool telling whether a move of the game is
+    quiet, i.e. may be reduced by Late Move Reductions: the game's optional
+    ``is_quiet(move)`` method, else whether the move is not one of the
+    game's optional ``noisy_moves()``, else all moves are quiet.
+    """
+    if hasattr(game, "is_quiet"):
+        return game.is_quiet
+    if hasattr(game, "noisy_moves"):
+        noisy_moves = game.noisy_moves()
+        return lambda move: move not in noisy_moves
+    return lambda move: True
+
+
+def quiescence(game, scoring, alpha, beta, qdepth, abort=None, stats=None):
+    """
+    Quiescence search: explores only the "noisy" moves of the game (given by
+    ``game.noisy_moves()``, e.g. captures), for at most ``qdepth`` moves,
+    until a quiet position is reached. At each node the player can also
+    "stand pat" and keep the static score of the position instead of playing
+    a noisy move. This avoids the horizon effect of stopping the search in
+    the middle of an exchange. This method is not meant to be used directly,
+    see the ``quiescence`` parameter of ``easyAI.Negamax``.
+    """
+
+    if (abort is not None) and abort():
+        raise SearchAborted()
+    if stats is not None:
+        stats["qnodes"] += 1
+
+    stand_pat = scoring(game)
+    if (qdepth == 0) or (stand_pat >= beta) or game.is_over():
+        return stand_pat
+    alpha = max(alpha, stand_pat)
+
+    state = game
+    unmake_move = hasattr(state, "unmake_move")
+    bestValue = stand_pat
+
+    for move in state.noisy_moves():
+
+        if not unmake_move:
+            game = state.copy()
+
+        game.make_move(move)
+        game.switch_player()
+
+        try:
+            value = -quiescence(game, scoring, -beta, -alpha, qdepth - 1, abort, stats)
+        finally:
+            if unmake_move:
+                game.switch_player()
+                game.unmake_move(move)
+
+        bestValue = max(bestValue, value)
+        if alpha < value:
+            alpha = value
+            if alpha >= beta:
+                break
+
+    return bestValue
+
+
+def negamax(
+    game,
+    depth,
+    origDepth,
+    scoring,
+    alpha=+inf,
+    beta=-inf,
+    tt=None,
+    abort=None,
+    pvs=False,
+    move_history=None,
+    ordering=None,
+    null_move=0,
+    null_move_verify=True,
+    allow_null_move=True,
+    lmr=None,
+    quiescence_depth=0,
+    stats=None,
+    pv=None,
+    ply=0,
+):
     """
     This implements Negamax with transposition tables.
     This method is not meant to be used directly. See ``easyAI.Negamax``
     for an example of practical use.
     This function is implemented (almost) acccording to
     http://en.wikipedia.org/wiki/Negamax
+
+    ``abort`` is an optional function f() -> bool, checked at every node.
+    When it returns True the search raises ``SearchAborted``, after the
+    moves being explored have been unmade.
+
+    If ``pvs`` is True, the search is a Principal Variation Search: only the
+    first move of each node is searched with the full window, the next ones
+    are searched with a null window (which only tells whether the move is
+    better than alpha) and re-searched with the full window if they are.
+
+    The moves are explored in the order given by ``ordering(game, moves)``
+    or by the game's optional ``order_moves(moves)`` method. Then an optional
+    ``move_history`` (``MoveHistory``) puts the killer moves and the moves
+    with a good history first, and is updated on each beta-cutoff. In any case
+    the move of the transposition table (if any) is tried first. When there
+    is neither ``ordering`` nor ``move_history`` and the game has an
+    ``iter_moves()`` method, the moves are generated lazily, in the order of
+    this method, and the generation stops at the first beta-cutoff.
+
+    If ``null_move`` (a depth reduction, typically 2) is not zero, null-move
+    pruning is used: at every node except the root (and, if ``pvs`` is True,
+    except the nodes of the principal variation, searched with a full
+    window), if beta is finite, the player passes and the opponent's reply
+    is searched at reduced depth with a null window. If the position is still
+    too good for the opponent (score above beta) the node is pruned. If
+    ``null_move_verify`` is True (zugzwang guard), the prune must be
+    confirmed by a normal reduced-depth search.
+    The null-move search only uses the transposition table if the game has a
+    ``make_null_move`` method (which must then change the key of the
+    position, ``ttentry()`` or ``zobrist``, with the player to move).
+    ``allow_null_move`` is False right after a null move (no two passes in a
+    row).
+
+    ``lmr`` enables Late Move Reductions. It is a tuple
+    ``(full_depth_moves, min_depth, reduction)``: at nodes with at least
+    ``min_depth`` moves left to search, the moves after the first
+    ``full_depth_moves`` ones (except killer moves and noisy moves, see
+    ``is_quiet_test``) are first searched with a null window at a depth
+    reduced by ``reduction``, and only searched again at full depth if they
+    turn out better than alpha.
+
+    If ``quiescence_depth`` is not zero and the game has a ``noisy_moves``
+    method, the leaves of the search are evaluated with a quiescence search
+    of at most ``quiescence_depth`` moves (see ``quiescence``).
+
+    ``stats`` is an optional dict in which the numbers of nodes of the search
+    (``"nodes"``) and of the quiescence search (``"qnodes"``) are counted.
+
+    ``pv`` is an optional list which is filled with the principal variation,
+    i.e. the sequence of best moves from this position. Each node builds its
+    line from the line of its best child (a recursive triangular PV table),
+    so the line stops early at positions found in the transposition table.
+
+    ``ply`` is the distance from the root.
     """
 
+    if (abort is not None) and abort():
+        raise SearchAborted()
+    if stats is not None:
+        stats["nodes"] += 1
+    if pv is not None:
+        pv.clear()
+
     alphaOrig = alpha
 
     # Is there a transposition table and is this game in it ?
@@ -31,6 +200,8 @@ def negamax(game, depth, origDepth, scoring, alpha=+inf, beta=-inf, tt=None):
             if flag == EXACT:
                 if depth == origDepth:
                     game.ai_move = lookup["move"]
+                if pv is not None:
+                    pv.append(lookup["move"])
                 return value
             elif flag == LOWERBOUND:
                 alpha = max(alpha, value)
@@ -48,39 +219,144 @@ def negamax(game, depth, origDepth, scoring, alpha=+inf, beta=-inf, tt=None):
         # Here we add 0.001 as a bonus to signify that victories in less turns
         # have more value than victories in many turns (and conversely, defeats
         # after many turns are preferred over defeats in less turns)
+        if quiescence_depth and (depth == 0) and hasattr(game, "noisy_moves"):
+            return quiescence(
+                game, scoring, alpha, beta, quiescence_depth, abort, stats
+            )
         return scoring(game) * (1 + 0.001 * depth)
 
-    if lookup is not None:
-        # Put the supposedly best move first in the list
-        possible_moves = game.possible_moves()
-        possible_moves.remove(lookup["move"])
-        possible_moves = [lookup["move"]] + possible_moves
+    state = game
+    unmake_move = hasattr(state, "unmake_move")
 
-    else:
+    def search_child(
+        alpha, beta, depth=depth - 1, allow_null_move=True, line=None, tt=tt
+    ):
+        return -negamax(
+            game,
+            depth,
+            origDepth,
+            scoring,
+            -beta,
+            -alpha,
+            tt,
+            abort,
+            pvs,
+            move_history,
+            ordering,
+            null_move,
+            null_move_verify,
+            allow_null_move,
+            lmr,
+            quiescence_depth,
+            stats,
+            line,
+            ply + 1,
+        )
 
-        possible_moves = game.possible_moves()
+    if (
+        null_move
+        and allow_null_move
+        and (depth != origDepth)
+        and (depth > null_move)
+        and (beta < inf)
+        and not (pvs and (math.nextafter(alpha, inf) < beta))  # PV node
+        and (not hasattr(game, "null_move_allowed") or game.null_move_allowed())
+    ):
+        # Let the opponent play twice. If we still get a score above beta,
+        # the opponent will avoid this position anyway.
+        null_alpha = math.nextafter(beta, -inf)
+        if not unmake_move:
+            game = state.copy()
+        make_null_move(game)
+        # Without make_null_move the key of the position does not change with
+        # the player to move, so the table would mix both players' entries.
+        null_tt = tt if hasattr(game, "make_null_move") else None
+        try:
+            value = search_child(
+                null_alpha, beta, depth - 1 - null_move, False, tt=null_tt
+            )
+        finally:
+            if unmake_move:
+                unmake_null_move(game)
+        game = state
+        if (value >= beta) and null_move_verify:
+            value = negamax(
+                game,
+                depth - null_move,
+                origDepth,
+                scoring,
+                null_alpha,
+                beta,
+                tt,
+                abort,
+                pvs,
+                move_history,
+                ordering,
+                null_move,
+                null_move_verify,
+                False,
+                lmr,
+                quiescence_depth,
+                stats,
+                None,
+                ply,
+            )
+        if value >= beta:
+            return beta
+
+    # The supposedly best move (from the transposition table) comes first
+    tt_move = None if (lookup is None) else lookup["move"]
+    possible_moves = generate_moves(game, ordering, move_history, ply, tt_move)
+
+    best_move = None
+    bestValue = -inf
+    is_quiet = None  # computed at the first late move, if any
 
-    state = game
-    best_move = possible_moves[0]
-    if depth == origDepth:
-        state.ai_move = possible_moves[0]
+    for i, move in enumerate(possible_moves):
 
-    bestValue = -inf
-    unmake_move = hasattr(state, "unmake_move")
+        if i == 0:
+            best_move = move
+            if depth == origDepth:
+                state.ai_move = move
 
-    for move in possible_moves:
+        reduce_move = (
+            (lmr is not None)
+            and (i >= lmr[0])
+            and (depth >= lmr[1])
+            and not (move_history and move_history.is_killer(move, ply))
+        )
+        if reduce_move:
+            if is_quiet is None:
+                is_quiet = is_quiet_test(state)
+            reduce_move = is_quiet(move)
 
         if not unmake_move:
             game = state.copy()  # re-initialize move
 
         game.make_move(move)
         game.switch_player()
-
-        move_alpha = -negamax(game, depth - 1, origDepth, scoring, -beta, -alpha, tt)
-
-        if unmake_move:
-            game.switch_player()
-            game.unmake_move(move)
+        child_pv = None if (pv is None) else []
+
+        try:
+            search_full_window = True
+            null_beta = math.nextafter(alpha, inf)
+            if reduce_move:
+                # late move: is it better than alpha, at reduced depth ?
+                reduced_depth = max(depth - 1 - lmr[2], 0)
+                move_alpha = search_child(
+                    alpha, null_beta, reduced_depth, line=child_pv
+                )
+                search_full_window = move_alpha > alpha
+            if search_full_window and pvs and (i > 0):
+                # null window: is this move better than the best one so far ?
+                move_alpha = search_child(alpha, null_beta, line=child_pv)
+                search_full_window = alpha < move_alpha < beta
+            if search_full_window:
+                move_alpha = search_child(alpha, beta, line=child_pv)
+        finally:
+            if unmake_move:
+                game.switch_player()
+                game.unmake_move(move)
 
         # bestValue = max( bestValue,  move_alpha )
         if bestValue < move_alpha:
@@ -89,15 +365,18 @@ def negamax(game, depth, origDepth, scoring, alpha=+inf, beta=-inf, tt=None):
 
         if alpha < move_alpha:
             alpha = move_alpha
+            if pv is not None:
+                pv[:] = [move] + child_pv
             # best_move = move
             if depth == origDepth:
                 state.ai_move = move
             if alpha >= beta:
+                if move_history is not None:
+                    move_history.record_cutoff(move, ply, depth)
                 break
 
-    if tt is not None:
+    if (tt is not None) and (best_move is not None):
 
-        assert best_move in possible_moves
         tt.store(
             game=state,
             depth=depth,
@@ -128,7 +407,8 @@ class Negamax:
 
     depth:
       How many moves in advance should the AI think ?
-      (2 moves = 1 complete turn)
+      (2 moves = 1 complete turn). If ``max_time`` is provided, this is the
+      maximal depth of the iterative deepening (can be None for no limit).
 
     scoring:
       A function f(game)-> score. If no scoring is provided
@@ -145,6 +425,89 @@ class Negamax:
       scoring: can be none if the game that the AI will be given has a
       ``scoring`` method.
 
+    max_time:
+      Time budget in seconds for each move. If provided, the AI searches at
+      depth 1, 2, 3... until the time is over, then aborts the current
+      iteration and plays the best move of the last completed depth (depth 1
+      is always completed). With a transposition table each iteration also
+      benefits from the move ordering found by the previous ones.
+
+    aspiration:
+      Half-width of the aspiration window. If provided, the AI searches
+      iteratively (depth 1, 2, ... ``depth``) and each new depth is searched
+      with the narrow window ``[previous - aspiration, previous + aspiration]``
+      around the score of the previous iteration. When the result falls
+      outside of the window, the window is widened (its half-width doubles)
+      and the depth is searched again. Works best with a transposition table.
+
+    move_history:
+      A ``MoveHistory`` (killer moves and history heuristic) used to order
+      the moves, so that alpha-beta pruning cuts more branches.
+
+    ordering:
+      A function f(game, moves) -> moves giving the order in which the moves
+      should be explored (best moves first). If not provided and the game has
+      a method ``order_moves(moves)``, this method will be used. If neither
+      this parameter nor ``move_history`` is provided and the game has a
+      method ``iter_moves()`` yielding its moves lazily (best moves first),
+      the moves are generated one by one, and the moves after a beta-cutoff
+      are never generated.
+
+    null_move:
+      Depth reduction of null-move pruning (typically 2), 0 to disable it.
+      At every node except the root (with ``PVS``, at nodes outside of the
+      principal variation), the AI lets the opponent play twice in a row: if
+      the position is still too good for the opponent, the node is pruned. A
+      null move is a simple switch of player, preceded by
+      ``game.make_null_move()`` and followed by ``game.unmake_null_move()``
+      if the game has these methods. These methods must change the key of
+      the position (``ttentry()`` or ``zobrist``) to tell the player to
+      move, else the positions after a null move are searched without the
+      transposition table. The game can forbid null moves in some positions
+      with a ``null_move_allowed()`` method. Null moves are unsafe in games
+      where passing would be an advantage (zugzwang), hence the next
+      parameter.
+
+    null_move_verify:
+      Zugzwang guard. If True, a node is only pruned by a null move if a
+      normal search at reduced depth confirms it. Set to False for games
+      without zugzwangs, for more pruning.
+
+    lmr_moves:
+      Enables Late Move Reductions if provided. At each node, the first
+      ``lmr_moves`` moves (at least 1) are searched normally. The next quiet
+      ones, which are unlikely to be the best if the moves are well ordered,
+      are first searched at a reduced depth, and searched again at full depth
+      only if they turn out better than the best move so far. Killer moves
+      are never reduced, nor are noisy moves: those for which the game's
+      optional ``is_quiet(move)`` method returns False, or else those of the
+      game's optional ``noisy_moves()``.
+
+    lmr_depth:
+      Moves are only reduced at nodes with at least ``lmr_depth`` moves left
+      to search.
+
+    lmr_reduction:
+      By how many moves the depth of late moves is reduced.
+
+    quiescence:
+      Maximal depth of the quiescence search (0 to disable it). When the
+      search reaches its depth limit in the middle of an exchange (for
+      instance a series of captures), the score of the position can be very
+      misleading. If the game has a ``noisy_moves()`` method returning the
+      "noisy" moves (captures, forcing moves...) among the possible moves,
+      the search continues with these moves only, up to ``quiescence`` more
+      moves, until a quiet position is reached. The number of nodes of the
+      last search and of its quiescence phase are stored in ``self.nodes``
+      and ``self.qnodes``.
+
+    After each search, the best move is also stored in ``game.ai_move``, its
+    score in ``self.alpha`` and the principal variation (the sequence of
+    moves expected from both players, starting with the best move) in
+    ``self.pv``. The ``search(game)`` method returns all this in a
+    ``SearchResult`` instead, and modifies neither the game nor the AI, so
+    that several threads can search with the same AI or the same game.
+
     Notes
     -----
 
@@ -160,28 +523,188 @@ class Negamax:
 
     """
 
-    def __init__(self, depth, scoring=None, win_score=+inf, tt=None):
+    principal_variation_search = False
+
+    def __init__(
+        self,
+        depth=None,
+        scoring=None,
+        win_score=+inf,
+        tt=None,
+        max_time=None,
+        aspiration=None,
+        move_history=None,
+        ordering=None,
+        null_move=0,
+        null_move_verify=True,
+        lmr_moves=None,
+        lmr_depth=3,
+        lmr_reduction=1,
+        quiescence=0,
+    ):
+        if (depth is None) and (max_time is None):
+            raise ValueError("Provide a depth or a max_time to Negamax.")
+        if (lmr_moves is not None) and (lmr_moves < 1):
+            raise ValueError("lmr_moves should be at least 1.")
         self.scoring = scoring
         self.depth = depth
         self.tt = tt
         self.win_score = win_score
-
-    def __call__(self, game):
+        self.max_time = max_time
+        self.aspiration = aspiration
+        self.move_history = move_history
+        self.ordering = ordering
+        self.null_move = null_move
+        self.null_move_verify = null_move_verify
+        self.lmr_moves = lmr_moves
+        self.lmr_depth = lmr_depth
+        self.lmr_reduction = lmr_reduction
+        self.quiescence = quiescence
+
+    def __call__(self, game, abort=None):
         """
         Returns the AI's best move given the current state of the game.
-        """
 
+        ``abort`` is an optional function f() -> bool which can stop the
+        search early (e.g. when the player is cancelled). The search is then
+        done by iterative deepening (up to ``self.depth``), and stops as soon
+        as ``abort()`` returns True, returning the best move of the deepest
+        completed depth.
+        """
+        stats = {"nodes": 0, "qnodes": 0}
+        result = self.search(game, abort, stats)
+        game.ai_move = result.move
+        self.alpha, self.pv = result.score, list(result.pv)
+        self.depth_reached = result.depth
+        self.nodes, self.qnodes = stats["nodes"], stats["qnodes"]
+        return result.move
+
+    def search(self, game, abort=None, stats=None):
+        """
+        Searches the game like ``__call__`` (see ``abort`` there) and returns
+        a ``SearchResult``. The search is done on a copy of the game, and the
+        attributes of the AI are not modified. The numbers of nodes are also
+        added to the ``"nodes"`` and ``"qnodes"`` of the optional ``stats``.
+        """
         scoring = (
             self.scoring if self.scoring else (lambda g: g.scoring())
         )  # horrible hack
 
-        self.alpha = negamax(
+        game = search_copy(game)
+        if hasattr(self.tt, "new_search"):
+            self.tt.new_search()
+        if stats is None:
+            stats = {"nodes": 0, "qnodes": 0}
+        nodes = stats["nodes"]
+        iterative = (self.max_time, self.aspiration, abort) != (None, None, None)
+        if iterative:
+            result = self.iterative_deepening(game, scoring, stats, abort)
+        else:
+            pv = []
+            score = self.aspiration_search(
+                game, self.depth, scoring, stats=stats, pv=pv
+            )
+            result = SearchResult(game.ai_move, score, self.depth, None, tuple(pv))
+        return result._replace(nodes=stats["nodes"] - nodes)
+
+    def iterative_deepening(self, game, scoring, stats=None, stop=None):
+        """
+        Searches at increasing depths until ``self.max_time`` is elapsed,
+        ``stop()`` returns True or ``self.depth`` is reached, and returns the
+        ``SearchResult`` of the deepest completed search.
+        """
+        if self.max_time is None:
+            abort = stop
+        else:
+            deadline = time.perf_counter() + self.max_time
+
+            def abort():
+                return (time.perf_counter() > deadline) or bool(stop and stop())
+
+        max_depth = inf if (self.depth is None) else self.depth
+        depth, alpha = 1, None
+        while depth <= max_depth:
+            pv = []
+            try:
+                # The first iteration is never aborted, to always have a move.
+                alpha = self.aspiration_search(
+                    game,
+                    depth,
+                    scoring,
+                    alpha,
+                    abort if (depth > 1) else None,
+                    stats,
+                    pv,
+                )
+            except SearchAborted:
+                break
+            result = SearchResult(game.ai_move, alpha, depth, None, tuple(pv))
+            if abs(alpha) >= self.win_score:
+                break
+            depth += 1
+
+        game.ai_move = result.move
+        return result
+
+    def aspiration_search(
+        self, game, depth, scoring, guess=None, abort=None, stats=None, pv=None
+    ):
+        """
+        Searches the game at the given depth, with a window centered on
+        ``guess`` if aspiration is enabled, and returns the score. The window
+        is widened and the search restarted as long as the score falls
+        outside of it.
+        """
+        lowest, highest = -self.win_score, +self.win_score
+        if (self.aspiration is None) or (guess is None) or (abs(guess) == inf):
+            alpha, beta = lowest, highest
+        else:
+            delta = self.aspiration
+            alpha, beta = max(guess - delta, lowest), min(guess + delta, highest)
+        while True:
+            value = self.root_search(
+                game, depth, scoring, alpha, beta, abort, stats, pv
+            )
+            if (value <= alpha) and (alpha > lowest):  # fail-low
+                delta *= 2
+                alpha = max(value - delta, lowest)
+            elif (value >= beta) and (beta < highest):  # fail-high
+                delta *= 2
+                beta = min(value + delta, highest)
+            else:
+                return value
+
+    def root_search(
+        self, game, depth, scoring, alpha, beta, abort=None, stats=None, pv=None
+    ):
+        """
+        Searches the game at the given depth with the window (alpha, beta),
+        sets ``game.ai_move`` and returns the score.
+        """
+        return negamax(
             game,
-            self.depth,
-            self.depth,
+            depth,
+            depth,
             scoring,
-            -self.win_score,
-            +self.win_score,
+            alpha,
+            beta,
             self.tt,
+            abort,
+            self.principal_variation_search,
+            self.move_history,
+            self.ordering,
+            self.null_move,
+            self.null_move_verify,
+            True,
+            self.lmr_settings(),
+            self.quiescence,
+            stats,
+            pv,
         )
-        return game.ai_move
+
+    def lmr_settings(self):
+        """Returns the Late Move Reductions settings of the ``negamax``
+        function: None, or (lmr_moves, lmr_depth, lmr_reduction)."""
+        if self.lmr_moves is None:
+            return None
+        return (self.lmr_moves, self.lmr_depth, self.lmr_reduction)
@@ -11,6 +11,9 @@ It also requires a reverse function: 'ttrestore' that takes the value from
 
 import copy
 
+from .MoveOrdering import order_moves
+from .SearchResult import SearchResult, search_copy
+
 LOWERBOUND, EXACT, UPPERBOUND = -1, 0, 1
 
 INF = float("infinity")
@@ -39,6 +42,7 @@ class StateObject(object):
         self.player = None
         self.alpha = -INF
         self.beta = INF
+        self.pv = []  # row of the triangular PV table: best line from here
 
     def prune(self):
         index = self.current_move + 1
@@ -64,7 +68,17 @@ class StateList(object):
         return self.state_list[key + 1]
 
 
-def negamax_nr(game, target_depth, scoring, alpha=-INF, beta=+INF):
+def negamax_nr(
+    game,
+    target_depth,
+    scoring,
+    alpha=-INF,
+    beta=+INF,
+    move_history=None,
+    ordering=None,
+    pv=None,
+    stats=None,
+):
 
     ################################################
     #
@@ -77,6 +91,10 @@ def negamax_nr(game, target_depth, scoring, alpha=-INF, beta=+INF):
     if not hasattr(game, "ttrestore"):
         raise AttributeError('Method "ttrestore()" missing from game.')
 
+    if pv is None:
+        pv = []
+    pv.clear()
+
     if game.is_over():
         score = scoring(game)
         game.ai_move = None
@@ -95,6 +113,7 @@ def negamax_nr(game, target_depth, scoring, alpha=-INF, beta=+INF):
                 best_score = score
             game.ttrestore(current_game)
         game.ai_move = best_move
+        pv.append(best_move)
         return best_score
 
     states = StateList(target_depth)
@@ -114,12 +133,21 @@ def negamax_nr(game, target_depth, scoring, alpha=-INF, beta=+INF):
     while True:
         parent = depth - 1
         if direction == DOWN:
+            if stats is not None:
+                stats["nodes"] += 1
             if (depth < target_depth) and not game.is_over():  # down we go...
                 states[depth].image = game.ttentry()
-                states[depth].move_list = game.possible_moves()
+                states[depth].move_list = order_moves(
+                    game, game.possible_moves(), ordering
+                )
+                if move_history is not None:
+                    states[depth].move_list = move_history.sort(
+                        states[depth].move_list, depth
+                    )
                 states[depth].best_move = 0
                 states[depth].best_score = -INF
                 states[depth].current_move = 0
+                states[depth].pv = []
                 states[depth].player = game.current_player
                 states[depth].alpha = -states[parent].beta  # inherit alpha from -beta
                 states[depth].beta = -states[parent].alpha  # inherit beta from -alpha
@@ -133,6 +161,8 @@ def negamax_nr(game, target_depth, scoring, alpha=-INF, beta=+INF):
                 if leaf_score > states[parent].best_score:
                     states[parent].best_score = leaf_score
                     states[parent].best_move = states[parent].current_move
+                    index = states[parent].current_move
+                    states[parent].pv = [states[parent].move_list[index]]
                 if states[parent].alpha < leaf_score:
                     states[parent].alpha = leaf_score
                 direction = UP
@@ -140,11 +170,18 @@ def negamax_nr(game, target_depth, scoring, alpha=-INF, beta=+INF):
             continue
         elif direction == UP:
             prune_time = states[depth].alpha >= states[depth].beta
+            if prune_time and (move_history is not None):
+                cutoff_move = states[depth].move_list[states[depth].current_move]
+                move_history.record_cutoff(cutoff_move, depth, target_depth - depth)
             if states[depth].out_of_moves() or prune_time:  # out of moves
                 bs = -states[depth].best_score
                 if bs > states[parent].best_score:
                     states[parent].best_score = bs
                     states[parent].best_move = states[parent].current_move
+                    if depth > 0:
+                        index = states[parent].current_move
+                        parent_move = states[parent].move_list[index]
+                        states[parent].pv = [parent_move] + states[depth].pv
                 if states[parent].alpha < bs:
                     states[parent].alpha = bs
                 if depth <= 0:
@@ -165,6 +202,7 @@ def negamax_nr(game, target_depth, scoring, alpha=-INF, beta=+INF):
     best_move = states[0].move_list[best_move_index]
     best_value = states[0].best_score
     game.ai_move = best_move
+    pv.extend(states[0].pv)
     return best_value
 
 
@@ -187,6 +225,11 @@ class NonRecursiveNegamax:
 
     This version of Negamax does not support transposition tables.
 
+    After each search, the principal variation (the sequence of moves
+    expected from both players, starting with the best move) is stored in
+    ``self.pv``, and its score in ``self.alpha``. The ``search(game)`` method
+    returns them in a ``SearchResult`` instead (see ``Negamax.search``).
+
     Parameters
     -----------
 
@@ -205,21 +248,59 @@ class NonRecursiveNegamax:
       A transposition table (a table storing game states and moves). Currently,
       this parameter is ignored.
 
+    move_history:
+      A ``MoveHistory`` (killer moves and history heuristic) used to order
+      the moves.
+
+    ordering:
+      A function f(game, moves) -> moves giving the order in which the moves
+      should be explored (best moves first). If not provided and the game has
+      a method ``order_moves(moves)``, this method will be used.
+
     """
 
-    def __init__(self, depth, scoring=None, win_score=+INF, tt=None):
+    def __init__(
+        self,
+        depth,
+        scoring=None,
+        win_score=+INF,
+        tt=None,
+        move_history=None,
+        ordering=None,
+    ):
         self.scoring = scoring
         self.depth = depth
         self.tt = tt
         self.win_score = win_score
+        self.move_history = move_history
+        self.ordering = ordering
 
     def __call__(self, game):
         """
         Returns the AI's best move given the current state of the game.
         """
+        result = self.search(game)
+        game.ai_move = result.move
+        self.alpha, self.pv = result.score, list(result.pv)
+        return result.move
+
+    def search(self, game):
+        """
+        Returns the ``SearchResult`` of the game. The search is done on a copy
+        of the game, and the attributes of the AI are not modified.
+        """
         scoring = self.scoring if self.scoring else (lambda g: g.scoring())
-        temp = game.copy()
-        self.alpha = negamax_nr(
-            temp, self.depth, scoring, -self.win_score, +self.win_score
+        temp = search_copy(game)
+        stats, pv = {"nodes": 0}, []
+        score = negamax_nr(
+            temp,
+            self.depth,
+            scoring,
+            -self.win_score,
+            +self.win_score,
+            self.move_history,
+            self.ordering,
+            pv,
+            stats,
         )
-        return temp.ai_move
+        return SearchResult(temp.ai_move, score, self.depth, stats["nodes"], tuple(pv))
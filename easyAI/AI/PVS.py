@@ -0,0 +1,27 @@
+from .Negamax import Negamax
+
+
+class PVS(Negamax):
+    """
+    This implements Principal Variation Search (also known as NegaScout),
+    a variant of Negamax with alpha-beta pruning. The following example shows
+    how to setup the AI and play a Connect Four game:
+
+        >>> from easyAI.games import ConnectFour
+        >>> from easyAI import PVS, Human_Player, AI_Player
+        >>> ai_algo = PVS(8) # AI will think 8 turns in advance
+        >>> game = ConnectFour([Human_Player(), AI_Player(ai_algo)])
+        >>> game.play()
+
+    At each node, the first move is searched with the full alpha-beta window
+    and the other moves with a null window, which is faster but only tells
+    whether the move is better than the first one. Only moves which turn out
+    to be better are searched again with the full window. The better the
+    moves are ordered (for instance with a transposition table), the fewer
+    re-searches are needed.
+
+    The parameters are the same as for ``Negamax``, and so is the use of
+    transposition tables.
+    """
+
+    principal_variation_search = True
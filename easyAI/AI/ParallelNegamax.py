@@ -0,0 +1,156 @@
+import os
+
+from .MoveOrdering import generate_moves
+from .Negamax import EXACT, LOWERBOUND, UPPERBOUND, Negamax, inf
+from .parallel import ProcessPool, ThreadPool, search_in_parallel
+
+
+class ParallelNegamax(Negamax):
+    """
+    Negamax with alpha-beta pruning, where the moves of the root are searched
+    in parallel by several worker processes. The following example shows how
+    to setup the AI and play a Connect Four game:
+
+        >>> from easyAI.games import ConnectFour
+        >>> from easyAI import ParallelNegamax, Human_Player, AI_Player
+        >>> ai_algo = ParallelNegamax(9, workers=4)
+        >>> game = ConnectFour([Human_Player(), AI_Player(ai_algo)])
+        >>> game.play()
+        >>> ai_algo.close() # stops the worker processes
+
+    The first root move (the supposedly best one) is searched alone, to get
+    a good alpha bound. The other root moves are then sent to the workers,
+    each with the best bound known when it is sent, so that the workers can
+    prune. The result (``game.ai_move``, ``self.alpha``, ``self.pv``...) is
+    the same as with ``Negamax``.
+
+    The worker processes are started at the first search and kept for the
+    next ones, until ``close()`` is called. The game is sent to the workers
+    without the AIs of its players, so it must be picklable, as well as the
+    ``scoring`` and ``ordering`` functions (use module-level functions rather
+    than lambdas). Games with or without ``unmake_move`` are supported.
+
+    Parameters
+    -----------
+
+    depth, scoring, win_score, tt, ...:
+      Same as for ``Negamax``. A transposition table and move history are
+      copied into each worker when it starts, and then each worker keeps
+      its own (the table of the AI only receives the root positions), unless
+      the table is a ``SharedTranspositionTable``, shared by all processes.
+
+    workers:
+      Number of worker processes (by default, the number of CPUs). With one
+      worker, the search is done in the current process, like ``Negamax``.
+
+    threads:
+      If True, the workers are threads of the current process instead of
+      processes (see ``ThreadPool``): nothing needs to be picklable, and the
+      transposition table of the AI (a ``TranspositionTable`` or a
+      ``SharedTranspositionTable``) is shared by all the threads. This only
+      speeds up the search on a free-threaded build of Python (3.13t+).
+    """
+
+    def __init__(
+        self,
+        depth=None,
+        scoring=None,
+        win_score=+inf,
+        tt=None,
+        workers=None,
+        threads=False,
+        **kw,
+    ):
+        Negamax.__init__(self, depth, scoring, win_score, tt, **kw)
+        self.workers = workers if workers else os.cpu_count()
+        self.threads = threads
+        self.pool = None
+
+    def __getstate__(self):
+        # The worker processes cannot be copied or pickled with the AI.
+        state = self.__dict__.copy()
+        state["pool"] = None
+        return state
+
+    def start_pool(self, workers):
+        """Returns a new pool of workers (processes or threads) for the
+        searches of this AI."""
+        pool_class = ThreadPool if self.threads else ProcessPool
+        return pool_class(workers, self.tt, self.move_history)
+
+    def close(self):
+        """Stops the worker processes (they restart at the next search)."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def search_options(self):
+        """Returns the keyword arguments of the ``negamax`` function which
+        describe the search, to send them to the workers."""
+        return dict(
+            pvs=self.principal_variation_search,
+            ordering=self.ordering,
+            null_move=self.null_move,
+            null_move_verify=self.null_move_verify,
+            lmr=self.lmr_settings(),
+            quiescence_depth=self.quiescence,
+        )
+
+    def root_search(
+        self, game, depth, scoring, alpha, beta, abort=None, stats=None, pv=None
+    ):
+        """
+        Searches the game at the given depth with the window (alpha, beta),
+        sending the root moves to the worker processes. Sets ``game.ai_move``
+        and returns the score.
+        """
+        lookup = None if (self.tt is None) else self.tt.lookup(game)
+        tt_move = None if (lookup is None) else lookup["move"]
+        moves = []
+        if not game.is_over():
+            moves = generate_moves(game, self.ordering, self.move_history, 0, tt_move)
+            moves = list(moves)
+        if (self.workers < 2) or (depth < 2) or (len(moves) < 2):
+            return Negamax.root_search(
+                self, game, depth, scoring, alpha, beta, abort, stats, pv
+            )
+
+        if self.pool is None:
+            self.pool = self.start_pool(self.workers)
+        if stats is not None:
+            stats["nodes"] += 1
+        best_value, best_index, best_line = search_in_parallel(
+            self.pool,
+            self.workers,
+            game,
+            moves,
+            depth,
+            depth,
+            self.scoring,
+            alpha,
+            beta,
+            self.search_options(),
+            abort,
+            stats,
+            first_alone=True,
+        )
+        best_move = moves[best_index]
+        game.ai_move = best_move
+        if pv is not None:
+            pv[:] = [best_move] + best_line
+        self.store(game, depth, best_value, best_move, alpha, beta)
+        return best_value
+
+    def store(self, game, depth, value, move, alpha, beta):
+        """Stores the result of the search of a game with the window
+        (alpha, beta) in the transposition table, if any."""
+        if self.tt is not None:
+            self.tt.store(
+                game=game,
+                depth=depth,
+                value=value,
+                move=move,
+                flag=UPPERBOUND
+                if (value <= alpha)
+                else (LOWERBOUND if (value >= beta) else EXACT),
+            )
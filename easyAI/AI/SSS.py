@@ -1,6 +1,7 @@
 # contributed by mrfesol (Tomasz Wesolowski)
 
 from .MTdriver import mtd
+from .SearchResult import SearchResult, search_copy
 
 
 class SSS:
@@ -33,6 +34,20 @@ class SSS:
       scoring: can be none if the game that the AI will be given has a
       ``scoring`` method.
 
+    move_history:
+      A ``MoveHistory`` (killer moves and history heuristic) used to order
+      the moves.
+
+    ordering:
+      A function f(game, moves) -> moves giving the order in which the moves
+      should be explored (best moves first). If not provided and the game has
+      a method ``order_moves(moves)``, this method will be used.
+
+    After each search, the line of play found for the best move (the
+    principal variation) is stored in ``self.pv``, and its score in
+    ``self.alpha``. The ``search(game)`` method returns them in a
+    ``SearchResult`` instead (see ``Negamax.search``).
+
     Notes
     -----
 
@@ -48,16 +63,36 @@ class SSS:
 
     """
 
-    def __init__(self, depth, scoring=None, win_score=100000, tt=None):
+    def __init__(
+        self,
+        depth,
+        scoring=None,
+        win_score=100000,
+        tt=None,
+        move_history=None,
+        ordering=None,
+    ):
         self.scoring = scoring
         self.depth = depth
         self.tt = tt
         self.win_score = win_score
+        self.move_history = move_history
+        self.ordering = ordering
 
     def __call__(self, game):
         """
         Returns the AI's best move given the current state of the game.
         """
+        result = self.search(game)
+        game.ai_move = result.move
+        self.alpha, self.pv = result.score, list(result.pv)
+        return result.move
+
+    def search(self, game):
+        """
+        Returns the ``SearchResult`` of the game. The search is done on a copy
+        of the game, and the attributes of the AI are not modified.
+        """
 
         scoring = (
             self.scoring if self.scoring else (lambda g: g.scoring())
@@ -68,6 +103,21 @@ class SSS:
         def next(lowerbound, upperbound, best_value):
             return best_value
 
-        self.alpha = mtd(game, first, next, self.depth, scoring, self.tt)
-
-        return game.ai_move
+        game = search_copy(game)
+        if hasattr(self.tt, "new_search"):
+            self.tt.new_search()
+        stats, pv = {"nodes": 0}, []
+        score = mtd(
+            game,
+            first,
+            next,
+            self.depth,
+            scoring,
+            self.tt,
+            self.move_history,
+            self.ordering,
+            pv,
+            stats,
+        )
+
+        return SearchResult(game.ai_move, score, self.depth, stats["nodes"], tuple(pv))
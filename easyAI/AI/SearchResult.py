@@ -0,0 +1,49 @@
+"""
+This module implements the result of a search, returned by the ``search``
+method of the AI algorithms.
+"""
+
+import copy
+from typing import NamedTuple
+
+
+class SearchResult(NamedTuple):
+    """
+    The result of the search of a position by an AI algorithm, returned by
+    its ``search(game)`` method. Unlike ``game.ai_move`` and the attributes
+    of the AI (``ai.alpha``, ``ai.pv``...), which are overwritten by every
+    search, a result is immutable and belongs to its search only.
+    """
+
+    move: object  # best move found
+    score: float  # score of the best move, for the player to move
+    depth: int  # depth of the (deepest completed) search
+    nodes: int  # number of positions searched, None if not counted
+    pv: tuple  # principal variation, starting with the best move
+
+
+def without_ais(game):
+    """
+    Returns a shallow copy of the game without the AI algorithms of its
+    players (which may hold process pools, lambda functions, large
+    transposition tables...), keeping the rest of the players (e.g. the
+    position of a chess knight).
+    """
+    if not getattr(game, "players", None):
+        return game
+    game = copy.copy(game)
+    players = []
+    for player in game.players:
+        player = copy.copy(player)
+        if hasattr(player, "AI_algo"):
+            player.AI_algo = None
+        players.append(player)
+    game.players = players
+    return game
+
+
+def search_copy(game):
+    """Returns a copy of the game for a search, so that the search (which
+    plays moves on its game and sets ``game.ai_move``) does not modify the
+    game of the caller, and several searches can run on the same game."""
+    return without_ais(game).copy()
@@ -0,0 +1,183 @@
+"""
+This module implements a fixed-size transposition table stored in shared
+memory, so that the AI searches of several processes can share it.
+"""
+
+import hashlib
+import struct
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .TranspositionTable import position_key
+
+# key ^ payload, then the payload: value, depth, flag, index of the move.
+ENTRY_DTYPE = np.dtype(
+    [("key", "<u8"), ("value", "<f4"), ("depth", "i1"), ("flag", "i1"), ("move", "<i2")]
+)
+PAYLOAD = struct.Struct("<fbbh")
+MASK64 = 2**64 - 1
+
+
+def hash64(entry):
+    """Returns a 64-bit key for a ``game.ttentry()`` (or a Zobrist key), the
+    same in every process (unlike Python's ``hash``, which is salted per
+    process)."""
+    if isinstance(entry, int):
+        return entry & MASK64
+    digest = hashlib.blake2b(repr(entry).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def move_to_index(game, move):
+    """
+    Returns the index of a move, as stored in the compact transposition
+    tables: the game's optional ``move_index(move)`` (an integer from 0 to
+    32767), else the index of the move in ``game.possible_moves()``.
+    """
+    if hasattr(game, "move_index"):
+        return game.move_index(move)
+    return game.possible_moves().index(move)
+
+
+def index_to_move(game, index):
+    """
+    Returns the move of an index given by ``move_to_index``, or None if it
+    is not a possible move of the game: the game's optional
+    ``index_move(index)`` (which must return None for such indices), else
+    the move at this index in ``game.possible_moves()``.
+    """
+    if hasattr(game, "index_move"):
+        return game.index_move(index)
+    moves = game.possible_moves()
+    return moves[index] if (index < len(moves)) else None
+
+
+class SharedTranspositionTable:
+    """
+    A transposition table of fixed size in shared memory
+    (``multiprocessing.shared_memory``), which several processes can read and
+    write at the same time. It is used by ``LazySMP``, and can be given to
+    ``Negamax``, ``PVS`` and ``ParallelNegamax``.
+
+    Each position is identified by its Zobrist key ``game.zobrist`` (if the
+    game has one) or a 64-bit hash of ``game.ttentry()``, and stored in the
+    slot ``key % size``, replacing the previous entry of the slot. An entry
+    takes 16 bytes: the score (as a 32-bit float), the depth, the flag and
+    the index of the best move (see ``move_to_index``: games can provide
+    ``move_index`` and ``index_move`` methods to avoid generating all their
+    moves at each store and lookup).
+    There are no locks: the key is stored XOR-ed with the rest of the entry,
+    so an entry which is being written by another process (or belongs to
+    another position) is simply not found.
+
+    When the table is pickled (e.g. sent to a worker process), only the
+    name of the shared memory is sent, and the unpickled table uses the
+    same memory. Copies of the table also share its memory.
+
+    Usage:
+
+        >>> table = SharedTranspositionTable(2**20)
+        >>> ai = LazySMP(10, tt=table, workers=4)
+        >>> ...
+        >>> table.close()  # frees the shared memory
+
+    Parameters
+    -----------
+
+    size:
+      Number of entries of the table (16 bytes each).
+
+    name:
+      Name of the shared memory of an existing table, to open it instead of
+      creating a new table.
+    """
+
+    def __init__(self, size=2**20, name=None):
+        if name is None:
+            nbytes = size * ENTRY_DTYPE.itemsize
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self.owner = True
+        else:
+            self.shm = attach_shared_memory(name)
+            self.owner = False
+        self.size = size
+        self.entries = np.ndarray(size, dtype=ENTRY_DTYPE, buffer=self.shm.buf)
+        # The same memory as 2 words per entry: key ^ payload, and payload
+        self.words = self.entries.view("<u8").reshape(size, 2)
+        if self.owner:
+            self.entries[:] = 0
+
+    @property
+    def name(self):
+        """Name of the shared memory, to open the table in other processes."""
+        return self.shm.name
+
+    def __getstate__(self):
+        return {"name": self.name, "size": self.size}
+
+    def __setstate__(self, state):
+        self.__init__(state["size"], state["name"])
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def key(self, game):
+        """Returns the 64-bit key of the game."""
+        return hash64(position_key(game))
+
+    def lookup(self, game):
+        """Requests the entry in the table. Returns None if the
+        entry has not been previously stored in the table."""
+        key = self.key(game)
+        checksum, payload = map(int, self.words[key % self.size])
+        if (payload == 0) or (checksum ^ payload != key):
+            return None
+        value, depth, flag, move_index = PAYLOAD.unpack(payload.to_bytes(8, "little"))
+        move = index_to_move(game, move_index)
+        if move is None:
+            return None
+        return {"value": value, "depth": depth, "flag": flag - 2, "move": move}
+
+    def __call__(self, game):
+        """Returns the move stored for this game (see
+        ``TranspositionTable.__call__``)."""
+        return self.lookup(game)["move"]
+
+    def store(self, **data):
+        """Stores an entry into the table. The data must contain the
+        ``game``, ``depth``, ``value``, ``move`` and ``flag``, like the
+        entries of the ``negamax`` function."""
+        game = data["game"]
+        key = self.key(game)
+        move_index = move_to_index(game, data["move"])
+        value, depth, flag = data["value"], data["depth"], data["flag"]
+        payload = PAYLOAD.pack(value, depth, flag + 2, move_index)
+        payload = int.from_bytes(payload, "little")
+        self.words[key % self.size] = (key ^ payload, payload)
+
+    def clear(self):
+        """Removes all the entries of the table."""
+        self.entries[:] = 0
+
+    def close(self):
+        """Closes the shared memory in this process. If this table created
+        the shared memory, it is also freed."""
+        self.entries = self.words = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def attach_shared_memory(name):
+    """Opens an existing shared memory. Unlike the process which created it,
+    this process must not free it when it exits."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
@@ -8,6 +8,14 @@ import json
 from ast import literal_eval as make_tuple
 
 
+def position_key(game):
+    """Returns the key identifying the position of a game in transposition
+    tables: its Zobrist key ``game.zobrist`` if the game has one (see
+    ``ZobristKeys``), else ``game.ttentry()``."""
+    zobrist = getattr(game, "zobrist", None)
+    return game.ttentry() if (zobrist is None) else zobrist
+
+
 class TranspositionTable:
     """
     A tranposition table made out of a Python dictionnary.
@@ -21,13 +29,20 @@ class TranspositionTable:
     the AI alogorithm no longer has to compute correct moves.
 
     Transposition tables can only be used on games which have a method
-    game.ttentry() -> string or tuple
+    game.ttentry() -> string or tuple, or a Zobrist key ``game.zobrist``
+    (an integer updated at each move, see ``ZobristKeys``), which is then
+    used instead of ``game.ttentry()``. The keys of a table saved with
+    **to_json_file** are then integers, so it must be loaded with
+    **use_tuples=True**.
 
     To save the table as a `pickle` file, use the **to_file** and **from_file**
     methods. A pickle file is binary and usually faster. A pickle file
     can also be appended to with new cached data. See python's pickle
     documentation for secuirty issues.
 
+    For very large tables, see ``ArrayTranspositionTable``, which uses much
+    less memory and can be mapped from a file larger than the memory.
+
     To save the table as a universal JSON file, use the **to_json_file**
     and **from_json_file** methods. For these methods, you must explicity
     pass **use_tuples=True** if game.ttentry() returns tuples rather than
@@ -48,15 +63,39 @@ class TranspositionTable:
     but they must be exhaustive in this case: if they are asked for
     a position that isn't stored in the table, it will lead to an error.
 
+    When an AI keeps the same table for a whole game, the table fills with
+    positions which can no longer occur. Each entry records the
+    ``generation`` of the table when it was stored, which the AIs increase
+    at the start of each search (``new_search``), so that old entries can be
+    removed with ``prune_older_than``:
+
+        >>> table.prune_older_than(table.generation - 2)  # last 3 searches
+
     """
 
     def __init__(self, own_dict=None):
         self.d = own_dict if own_dict is not None else dict()
+        self.generation = 0
+
+    def __len__(self):
+        return len(self.d)
+
+    def new_search(self):
+        """Starts a new generation of entries. This is called by the AIs at
+        the start of each search."""
+        self.generation += 1
+
+    def prune_older_than(self, generation):
+        """Removes the entries stored before the given generation."""
+        for entry in list(self.d):
+            data = self.d[entry]
+            if (data is not None) and (data.get("generation", 0) < generation):
+                del self.d[entry]
 
     def lookup(self, game):
         """Requests the entry in the table. Returns None if the
         entry has not been previously stored in the table."""
-        return self.d.get(game.ttentry(), None)
+        return self.d.get(position_key(game), None)
 
     def __call__(self, game):
         """
@@ -68,11 +107,12 @@ class TranspositionTable:
         >>> # negamax boosted with a transposition table !
         >>> Negamax(10, tt= my_dictTranspositionTable)
         """
-        return self.d[game.ttentry()]["move"]
+        return self.d[position_key(game)]["move"]
 
     def store(self, **data):
         """ Stores an entry into the table """
-        entry = data.pop("game").ttentry()
+        entry = position_key(data.pop("game"))
+        data["generation"] = self.generation
         self.d[entry] = data
 
     def to_file(self, filename):
@@ -0,0 +1,166 @@
+from .MoveOrdering import generate_moves
+from .Negamax import Negamax, SearchAborted, inf, negamax
+from .ParallelNegamax import ParallelNegamax
+from .parallel import search_in_parallel
+
+
+class YBWC(ParallelNegamax):
+    """
+    Parallel alpha-beta search with the Young Brothers Wait Concept. At each
+    node of the first ``split_plies`` plies, the first move (the "eldest
+    brother") is searched first, in the current process and splitting its
+    own subtree in the same way. Then the other moves ("younger brothers")
+    are searched in parallel by the worker processes, with the alpha bound
+    given by the eldest brother, which makes them prune much more than the
+    moves of a search splitting only at the root. When a move produces a
+    beta-cutoff, the searches of its brothers are aborted. Deeper nodes are
+    searched with the ``negamax`` function, like ``Negamax`` does.
+
+        >>> from easyAI.games import ConnectFour
+        >>> from easyAI import YBWC, Human_Player, AI_Player
+        >>> ai_algo = YBWC(9, workers=8)
+        >>> game = ConnectFour([Human_Player(), AI_Player(ai_algo)])
+        >>> game.play()
+        >>> ai_algo.close() # stops the worker processes
+
+    The requirements on the game and the functions are the same as for
+    ``ParallelNegamax``.
+
+    Parameters
+    -----------
+
+    depth, scoring, win_score, tt, workers, threads, ...:
+      Same as for ``ParallelNegamax``.
+
+    split_plies:
+      Number of plies from the root where the nodes are split between the
+      workers.
+    """
+
+    def __init__(
+        self,
+        depth=None,
+        scoring=None,
+        win_score=+inf,
+        tt=None,
+        workers=None,
+        split_plies=3,
+        **kw,
+    ):
+        ParallelNegamax.__init__(self, depth, scoring, win_score, tt, workers, **kw)
+        self.split_plies = split_plies
+
+    def root_search(
+        self, game, depth, scoring, alpha, beta, abort=None, stats=None, pv=None
+    ):
+        """
+        Searches the game at the given depth with the window (alpha, beta),
+        splitting the first plies between the worker processes. Sets
+        ``game.ai_move`` and returns the score.
+        """
+        if (self.workers < 2) or (depth < 2) or game.is_over():
+            return Negamax.root_search(
+                self, game, depth, scoring, alpha, beta, abort, stats, pv
+            )
+        if self.pool is None:
+            self.pool = self.start_pool(self.workers)
+        value, line = self.split_search(
+            game, depth, depth, scoring, alpha, beta, abort, stats
+        )
+        if pv is not None:
+            pv[:] = line
+        return value
+
+    def split_search(
+        self, game, depth, origDepth, scoring, alpha, beta, abort, stats, ply=0
+    ):
+        """
+        Searches a node of the first plies: the eldest brother first, then
+        the younger brothers in parallel. Returns the score of the game and
+        the best line of play from this game.
+        """
+        if (ply >= self.split_plies) or (depth < 2) or game.is_over():
+            line = []
+            value = negamax(
+                game,
+                depth,
+                origDepth,
+                scoring,
+                alpha,
+                beta,
+                self.tt,
+                abort,
+                self.principal_variation_search,
+                self.move_history,
+                self.ordering,
+                self.null_move,
+                self.null_move_verify,
+                True,
+                self.lmr_settings(),
+                self.quiescence,
+                stats,
+                line,
+                ply,
+            )
+            return value, line
+
+        if (abort is not None) and abort():
+            raise SearchAborted()
+        if stats is not None:
+            stats["nodes"] += 1
+        lookup = None if (self.tt is None) else self.tt.lookup(game)
+        tt_move = None if (lookup is None) else lookup["move"]
+        moves = generate_moves(game, self.ordering, self.move_history, ply, tt_move)
+        moves = list(moves)
+
+        # The eldest brother is searched first, and split in turn.
+        eldest = moves[0]
+        unmake_move = hasattr(game, "unmake_move")
+        child = game if unmake_move else game.copy()
+        child.make_move(eldest)
+        child.switch_player()
+        try:
+            value, line = self.split_search(
+                child,
+                depth - 1,
+                origDepth,
+                scoring,
+                -beta,
+                -alpha,
+                abort,
+                stats,
+                ply + 1,
+            )
+        finally:
+            if unmake_move:
+                child.switch_player()
+                child.unmake_move(eldest)
+        best_value, best_move, best_line = -value, eldest, [eldest] + line
+
+        if max(alpha, best_value) < beta:
+            # The younger brothers are searched in parallel.
+            value, index, line = search_in_parallel(
+                self.pool,
+                self.workers,
+                game,
+                moves[1:],
+                depth,
+                origDepth,
+                self.scoring,
+                max(alpha, best_value),
+                beta,
+                self.search_options(),
+                abort,
+                stats,
+                ply,
+            )
+            if value > best_value:
+                best_move = moves[1 + index]
+                best_value, best_line = value, [best_move] + line
+        elif self.move_history is not None:
+            self.move_history.record_cutoff(eldest, ply, depth)
+
+        if ply == 0:
+            game.ai_move = best_move
+        self.store(game, depth, best_value, best_move, alpha, beta)
+        return best_value, best_line
@@ -0,0 +1,83 @@
+"""
+This module implements Zobrist hashing: the key of a position is the XOR of
+random 64-bit numbers, one for each piece on each square, so that a move
+updates the key in a few operations instead of rebuilding a ``ttentry()``.
+"""
+
+import random
+
+import numpy as np
+
+
+class ZobristKeys:
+    """
+    Random 64-bit keys for the Zobrist hashing of a game: one key for each
+    piece on each square of the board, and a key ``side`` for the player to
+    move.
+
+    A game supports Zobrist hashing by having an integer attribute (or
+    property) ``zobrist``, the key of its position, which it updates in
+    ``make_move`` and ``unmake_move`` by XOR-ing the keys of the pieces which
+    leave or reach squares. The transposition tables then identify positions
+    by ``game.zobrist`` instead of ``game.ttentry()``, which is much faster
+    for large boards. Two positions are considered identical if they have the
+    same key, which is very unlikely to be wrong with 64-bit keys.
+
+    Usage (for a 8x8 board with pieces 1 and 2, 0 meaning an empty square):
+
+        >>> KEYS = ZobristKeys((8, 8), 3)
+        >>> self.zobrist = KEYS.hash(self.board)  # in the game's __init__
+        >>> self.zobrist ^= KEYS[i, j, piece]  # when a piece arrives in (i, j)
+
+    The keys are generated from ``seed``, so that they are the same in every
+    process (e.g. in the workers of ``ParallelNegamax``). They are not copied
+    with the games which use them.
+
+    Parameters
+    -----------
+
+    shape:
+      The number of squares of the board, or its shape, e.g. ``(8, 8)``.
+
+    n_pieces:
+      The number of kinds of pieces, including the "empty square" piece 0
+      (which has keys, but is ignored by ``hash``).
+
+    seed:
+      Seed of the random generator of the keys.
+    """
+
+    def __init__(self, shape, n_pieces, seed=0):
+        shape = tuple(np.atleast_1d(shape))
+        rng = random.Random(seed)
+
+        def make_table(shape):
+            if not shape:
+                return [rng.getrandbits(64) for _ in range(n_pieces)]
+            return [make_table(shape[1:]) for _ in range(shape[0])]
+
+        self.shape = shape
+        self.table = make_table(shape)
+        self.side = rng.getrandbits(64)
+
+    def __getitem__(self, index):
+        """Returns the key of a piece on a square: ``keys[i, j, piece]``."""
+        table = self.table
+        for i in index:
+            table = table[i]
+        return table
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def hash(self, board):
+        """Returns the key of a board (an array of the board's shape giving
+        the piece on each square, with 0 for empty squares)."""
+        board = np.asarray(board)
+        key = 0
+        for index in zip(*np.nonzero(board)):
+            key ^= self[index + (board[index],)]
+        return key
@@ -1,6 +1,16 @@
 from .Negamax import Negamax
+from .PVS import PVS
+from .ParallelNegamax import ParallelNegamax
+from .LazySMP import LazySMP
+from .YBWC import YBWC
 from .NonRecursiveNegamax import NonRecursiveNegamax
 from .TranspositionTable import TranspositionTable
+from .BoundedTranspositionTable import BoundedTranspositionTable
+from .SharedTranspositionTable import SharedTranspositionTable
+from .ArrayTranspositionTable import ArrayTranspositionTable
+from .MoveOrdering import MoveHistory
+from .Zobrist import ZobristKeys
+from .SearchResult import SearchResult
 from .solving import solve_with_iterative_deepening, solve_with_depth_first_search
 from .MTdriver import mtd
 from .SSS import SSS
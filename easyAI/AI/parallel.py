@@ -0,0 +1,295 @@
+"""
+Helpers to run the searches of easyAI in several processes (or threads).
+The AI classes using them are ``ParallelNegamax`` and the other parallel
+searches.
+"""
+
+import copy
+import ctypes
+import multiprocessing
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+from .MoveOrdering import generate_moves
+from .Negamax import SearchAborted, negamax, inf
+from .SearchResult import without_ais
+from .SharedTranspositionTable import SharedTranspositionTable
+from .TranspositionTable import TranspositionTable
+
+# State of a worker (process or thread), set once by ``init_worker`` when it
+# starts.
+_worker = threading.local()
+
+
+def game_for_worker(game):
+    """Returns a shallow copy of the game which can be sent to a worker
+    process, without the AI algorithms of its players (see ``without_ais``)."""
+    return without_ais(game)
+
+
+def init_worker(abort_flag, tt=None, move_history=None):
+    """Initializes a worker process with the shared abort flag, and its own
+    transposition table and move history (kept from one task to the next)."""
+    _worker.abort_flag = abort_flag
+    _worker.tt = tt
+    _worker.move_history = move_history
+
+
+def init_thread(abort_flag, tt=None, move_history=None):
+    """Initializes a worker thread like ``init_worker``, but with the
+    transposition table shared by all threads and its own copy of the move
+    history (which cannot be updated by several threads at a time)."""
+    init_worker(abort_flag, tt, copy.deepcopy(move_history))
+
+
+def worker_aborted():
+    """Returns True when the process pool asks its workers to stop."""
+    return bool(_worker.abort_flag.value)
+
+
+def search_move(
+    game, move, depth, origDepth, scoring, alpha, beta, options, ply=0
+):
+    """
+    Plays ``move`` on the game (at distance ``ply`` from the root) and
+    searches the resulting position with the ``negamax`` function, in a
+    worker process. ``options`` are the keyword arguments of ``negamax``
+    describing the search (pvs, null_move...).
+
+    Returns the score of the move for the player who plays it, the line of
+    play following the move and the node counts of the search.
+    """
+    scoring = scoring if scoring else (lambda g: g.scoring())
+    game.make_move(move)
+    game.switch_player()
+    stats, line = {"nodes": 0, "qnodes": 0}, []
+    value = -negamax(
+        game,
+        depth - 1,
+        origDepth,
+        scoring,
+        -beta,
+        -alpha,
+        _worker.tt,
+        worker_aborted,
+        move_history=_worker.move_history,
+        stats=stats,
+        pv=line,
+        ply=ply + 1,
+        **options,
+    )
+    return value, line, stats
+
+
+def helper_search(game, depth, rotation, scoring, options):
+    """
+    Searches the game in a worker process until the search is aborted, to
+    fill the shared transposition table of the worker (Lazy SMP). The root
+    moves are rotated by ``rotation`` places so that the helpers start with
+    different moves. Returns the number of nodes searched.
+    """
+    scoring = scoring if scoring else (lambda g: g.scoring())
+    tt, move_history = _worker.tt, _worker.move_history
+    moves = list(generate_moves(game, options["ordering"], move_history))
+    rotation = rotation % len(moves)
+    moves = moves[rotation:] + moves[:rotation]
+    unmake_move = hasattr(game, "unmake_move")
+    stats, alpha = {"nodes": 0, "qnodes": 0}, -inf
+    try:
+        for move in moves:
+            child = game if unmake_move else game.copy()
+            child.make_move(move)
+            child.switch_player()
+            try:
+                value = -negamax(
+                    child,
+                    depth - 1,
+                    depth,
+                    scoring,
+                    -inf,
+                    -alpha,
+                    tt,
+                    worker_aborted,
+                    move_history=move_history,
+                    stats=stats,
+                    ply=1,
+                    **options,
+                )
+            finally:
+                if unmake_move:
+                    child.switch_player()
+                    child.unmake_move(move)
+            alpha = max(alpha, value)
+    except SearchAborted:
+        pass
+    return stats["nodes"]
+
+
+class ProcessPool:
+    """
+    A pool of worker processes running searches, with a flag shared
+    by all workers which makes their current searches abort.
+
+    Parameters
+    -----------
+
+    workers:
+      Number of worker processes.
+
+    tt, move_history:
+      Transposition table and move history copied into each worker when it
+      starts. Each worker then keeps its own copy from one search to the next.
+    """
+
+    def __init__(self, workers, tt=None, move_history=None):
+        context = multiprocessing.get_context()
+        self.abort_flag = context.RawValue("b", 0)
+        self.executor = ProcessPoolExecutor(
+            workers,
+            mp_context=context,
+            initializer=init_worker,
+            initargs=(self.abort_flag, tt, move_history),
+        )
+
+    def submit(self, function, *args):
+        """Schedules ``function(*args)`` in a worker, returns its future."""
+        return self.executor.submit(function, *args)
+
+    def task_game(self, game):
+        """Returns the game to send with a task, which the task may modify
+        (each worker process receives its own copy of the game anyway)."""
+        return game
+
+    def abort(self):
+        """Makes the running searches raise ``SearchAborted``."""
+        self.abort_flag.value = 1
+
+    def reset(self):
+        """Allows new searches after an ``abort()``."""
+        self.abort_flag.value = 0
+
+    def shutdown(self):
+        """Stops the worker processes."""
+        self.executor.shutdown(cancel_futures=True)
+
+
+class ThreadPool(ProcessPool):
+    """
+    A pool of worker threads, used like a ``ProcessPool``. Nothing is
+    pickled: each task gets a copy of its game (``game.copy()``), and all the
+    threads share the transposition table given (a ``TranspositionTable``,
+    whose entries are replaced in one step, or a ``SharedTranspositionTable``,
+    whose entries are checked with their key). Other tables are rejected,
+    as a thread could read an entry which another thread is writing. Each
+    thread has its own copy of the move history.
+
+    The threads only search in parallel on a free-threaded build of Python
+    (3.13t and above); on other builds they take turns.
+    """
+
+    def __init__(self, workers, tt=None, move_history=None):
+        if (tt is not None) and not isinstance(
+            tt, (TranspositionTable, SharedTranspositionTable)
+        ):
+            raise ValueError(
+                "Threads can only share a TranspositionTable or a "
+                "SharedTranspositionTable."
+            )
+        self.abort_flag = ctypes.c_byte(0)
+        self.executor = ThreadPoolExecutor(
+            workers,
+            initializer=init_thread,
+            initargs=(self.abort_flag, tt, move_history),
+        )
+
+    def task_game(self, game):
+        """Returns a copy of the game, which a task can modify while other
+        threads search the game."""
+        return game.copy()
+
+
+def search_in_parallel(
+    pool,
+    workers,
+    game,
+    moves,
+    depth,
+    origDepth,
+    scoring,
+    alpha,
+    beta,
+    options,
+    abort=None,
+    stats=None,
+    ply=0,
+    first_alone=False,
+):
+    """
+    Searches the given moves of the game with ``search_move``, in at most
+    ``workers`` processes of the pool at a time. Each move is sent with the
+    best alpha bound known at that time. At the first beta-cutoff, the other
+    searches are aborted. If ``first_alone`` is True, the first move is
+    searched alone, to get a good bound for the next ones.
+
+    Returns the best score, the index of the best move in ``moves`` and the
+    line of play following this move. Raises ``SearchAborted`` if ``abort()``
+    returns True.
+    """
+    worker_game = game_for_worker(game)
+    best_value, best_index, best_line = -inf, None, []
+    pending = {}  # future -> (index of the move, alpha sent)
+    next_index = 0
+    try:
+        while (next_index < len(moves)) or pending:
+            n_parallel = 1 if (first_alone and (best_index is None)) else workers
+            while (next_index < len(moves)) and (len(pending) < n_parallel):
+                future = pool.submit(
+                    search_move,
+                    pool.task_game(worker_game),
+                    moves[next_index],
+                    depth,
+                    origDepth,
+                    scoring,
+                    alpha,
+                    beta,
+                    options,
+                    ply,
+                )
+                pending[future] = (next_index, alpha)
+                next_index += 1
+            timeout = None if (abort is None) else 0.01
+            done, _ = wait(pending, timeout, FIRST_COMPLETED)
+            if (abort is not None) and abort():
+                raise SearchAborted()
+            for future in done:
+                index, move_alpha = pending.pop(future)
+                value, line, move_stats = future.result()
+                if stats is not None:
+                    stats["nodes"] += move_stats["nodes"]
+                    stats["qnodes"] += move_stats["qnodes"]
+                # Between equal exact scores, prefer the first move.
+                if (value > best_value) or (
+                    (value == best_value)
+                    and (index < best_index)
+                    and (move_alpha < value < beta)
+                ):
+                    best_value, best_index, best_line = value, index, line
+                alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+    finally:
+        # Stop the searches which are not needed anymore
+        if pending:
+            pool.abort()
+            for future in pending:
+                try:
+                    future.result()
+                except SearchAborted:
+                    pass
+        pool.reset()
+    return best_value, best_index, best_line
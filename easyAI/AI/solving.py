@@ -1,4 +1,12 @@
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
 from easyAI.AI import Negamax
+from easyAI.AI.MoveOrdering import order_moves
+from easyAI.AI.Negamax import SearchAborted
+from easyAI.AI.TranspositionTable import TranspositionTable
+from easyAI.AI.parallel import game_for_worker
 from easyAI.Player import AI_Player
 
 
@@ -83,7 +91,17 @@ def solve_with_iterative_deepening(
     return result, depth, game.ai_move
 
 
-def solve_with_depth_first_search(game, win_score, maxdepth=50, tt=None, depth=0):
+def solve_with_depth_first_search(
+    game,
+    win_score,
+    maxdepth=50,
+    tt=None,
+    depth=0,
+    ordering=None,
+    workers=None,
+    split_depth=2,
+    abort=None,
+):
     """
     Solves a game using a depth-first search: the game is explored until
     endgames are reached.
@@ -119,6 +137,24 @@ def solve_with_depth_first_search(game, win_score, maxdepth=50, tt=None, depth=0
     depth:
       Index of the current depth (don't touch that).
 
+    ordering:
+      A function f(game, moves) -> moves giving the order in which the moves
+      should be explored (most likely wins first). If not provided and the
+      game has a method ``order_moves(moves)``, this method will be used.
+
+    workers:
+      Number of worker processes to solve the game in parallel (see
+      ``solve_in_parallel``). By default the game is solved in the current
+      process.
+
+    split_depth:
+      When solving in parallel, number of moves after which the positions
+      are solved by the workers.
+
+    abort:
+      An optional function f() -> bool. If it returns True, the search
+      stops and raises ``SearchAborted``.
+
     Returns
     --------
 
@@ -129,6 +165,13 @@ def solve_with_depth_first_search(game, win_score, maxdepth=50, tt=None, depth=0
 
     """
 
+    if (workers is not None) and (depth == 0):
+        return solve_in_parallel(
+            game, win_score, workers, split_depth, maxdepth, tt, ordering
+        )
+    if (abort is not None) and abort():
+        raise SearchAborted()
+
     # Is there a transposition table and is this game in it ?
     lookup = None if (tt is None) else tt.lookup(game)
     if lookup is not None:
@@ -144,7 +187,7 @@ def solve_with_depth_first_search(game, win_score, maxdepth=50, tt=None, depth=0
             tt.store(game=game, value=value, move=None)
         return value
 
-    possible_moves = game.possible_moves()
+    possible_moves = order_moves(game, game.possible_moves(), ordering)
 
     state = game
     unmake_move = hasattr(state, "unmake_move")
@@ -159,13 +202,14 @@ def solve_with_depth_first_search(game, win_score, maxdepth=50, tt=None, depth=0
         game.make_move(move)
         game.switch_player()
 
-        move_value = -solve_with_depth_first_search(
-            game, win_score, maxdepth, tt, depth + 1
-        )
-
-        if unmake_move:
-            game.switch_player()
-            game.unmake_move(move)
+        try:
+            move_value = -solve_with_depth_first_search(
+                game, win_score, maxdepth, tt, depth + 1, ordering, abort=abort
+            )
+        finally:
+            if unmake_move:
+                game.switch_player()
+                game.unmake_move(move)
 
         if move_value == 1:
             if tt is not None:
@@ -180,3 +224,161 @@ def solve_with_depth_first_search(game, win_score, maxdepth=50, tt=None, depth=0
         tt.store(game=state, value=best_value, move=best_move)
 
     return best_value
+
+
+def solve_in_parallel(
+    game, win_score, workers=None, split_depth=2, maxdepth=50, tt=None, ordering=None
+):
+    """
+    Solves a game like ``solve_with_depth_first_search``, in several
+    processes. The game tree is developed in the current process for
+    ``split_depth`` moves, then the positions reached are solved by a pool of
+    worker processes, and their results (1, 0 or -1) are combined back up to
+    the initial position. As soon as a position is proven to be a win, the
+    searches of its other moves are cancelled.
+
+    Each worker uses its own transposition table, a copy of ``tt`` if
+    provided, else a new ``TranspositionTable`` if the game has a
+    ``ttentry`` method. ``tt`` only receives the initial position.
+
+    The game must be picklable (the AIs of its players are not sent to the
+    workers), as well as the ``ordering`` function.
+
+    Returns 1, 0 or -1 as ``solve_with_depth_first_search``.
+    """
+    root = SolvingNode()
+    frontier = []  # (node, game) to be solved by the workers
+    root.develop(game, split_depth, win_score, ordering, frontier)
+
+    if root.value is None:
+        if (tt is None) and hasattr(game, "ttentry"):
+            tt = TranspositionTable()
+        workers = workers if workers else os.cpu_count()
+        context = multiprocessing.get_context()
+        abort_flags = context.RawArray("b", len(frontier))
+        executor = ProcessPoolExecutor(
+            workers,
+            mp_context=context,
+            initializer=init_solver,
+            initargs=(abort_flags, tt),
+        )
+        pending = {}  # future -> (node, index of its abort flag)
+        try:
+            for index, (node, node_game) in enumerate(frontier):
+                if node.is_needed():
+                    future = executor.submit(
+                        solve_subtree,
+                        index,
+                        game_for_worker(node_game),
+                        win_score,
+                        maxdepth,
+                        split_depth,
+                        ordering,
+                    )
+                    pending[future] = (node, index)
+            while (root.value is None) and pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, index = pending.pop(future)
+                    if node.is_needed():
+                        node.solved(future.result())
+                # Cancel the searches of the positions which don't matter
+                for future, (node, index) in list(pending.items()):
+                    if not node.is_needed():
+                        abort_flags[index] = 1
+                        if future.cancel():
+                            pending.pop(future)
+        finally:
+            for node, index in pending.values():
+                abort_flags[index] = 1
+            executor.shutdown(cancel_futures=True)
+
+    if tt is not None:
+        tt.store(game=game, value=root.value, move=root.best_move())
+    return root.value
+
+
+class SolvingNode:
+    """A position of the top of the game tree, in ``solve_in_parallel``."""
+
+    def __init__(self, parent=None, move=None):
+        self.parent = parent
+        self.move = move
+        self.children = []
+        self.value = None  # 1, 0 or -1 for the player to move, once solved
+
+    def develop(self, game, split_depth, win_score, ordering, frontier):
+        """Creates the nodes of the next ``split_depth`` moves, solves the
+        finished games and adds the other positions to ``frontier``."""
+        if game.is_over():
+            score = game.scoring()
+            self.solved(
+                1 if (score >= win_score) else (-1 if -score >= win_score else 0)
+            )
+        elif split_depth == 0:
+            frontier.append((self, game))
+        else:
+            moves = order_moves(game, game.possible_moves(), ordering)
+            self.children = [SolvingNode(self, move) for move in moves]
+            for child in self.children:
+                if not self.is_needed():
+                    break
+                child_game = game.copy()
+                child_game.play_move(child.move)
+                child.develop(
+                    child_game, split_depth - 1, win_score, ordering, frontier
+                )
+
+    def is_needed(self):
+        """Returns False if this node or one of its ancestors is solved."""
+        node = self
+        while node is not None:
+            if node.value is not None:
+                return False
+            node = node.parent
+        return True
+
+    def solved(self, value):
+        """Sets the value of the node and updates its parent."""
+        self.value = value
+        parent = self.parent
+        if (parent is None) or (parent.value is not None):
+            return
+        move_values = [
+            -child.value for child in parent.children if child.value is not None
+        ]
+        if (1 in move_values) or (len(move_values) == len(parent.children)):
+            parent.solved(max(move_values))
+
+    def best_move(self):
+        """Returns the first move which leads to the value of the node."""
+        for child in self.children:
+            if (child.value is not None) and (-child.value == self.value):
+                return child.move
+        return None
+
+
+# State of a worker process of ``solve_in_parallel``
+_solver = {}
+
+
+def init_solver(abort_flags, tt):
+    _solver.update(abort_flags=abort_flags, tt=tt)
+
+
+def solve_subtree(index, game, win_score, maxdepth, depth, ordering):
+    """Solves a position in a worker process of ``solve_in_parallel``,
+    until its abort flag is set."""
+    abort_flags = _solver["abort_flags"]
+    try:
+        return solve_with_depth_first_search(
+            game,
+            win_score,
+            maxdepth,
+            _solver["tt"],
+            depth,
+            ordering,
+            abort=lambda: abort_flags[index],
+        )
+    except SearchAborted:
+        return None
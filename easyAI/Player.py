@@ -2,6 +2,14 @@
 This module implements the Player (Human or AI), which is basically an
 object with an ``ask_move(game)`` method
 """
+import asyncio
+import copy
+import inspect
+import threading
+import time
+
+import numpy as np
+
 try:
     input = raw_input
 except NameError:
@@ -52,12 +60,171 @@ class AI_Player:
     """
     Class for an AI player. This class must be initialized with an
     AI algortihm, like ``AI_Player( Negamax(9) )``
+
+    With ``ponder=True``, the AI keeps thinking during the opponent's turn:
+    after each move, it searches (in a background thread) the position
+    expected after the opponent's reply, which is the second move of the
+    principal variation ``AI_algo.pv``. If the opponent plays this reply,
+    the search simply continues (for at most ``AI_algo.max_time`` seconds if
+    the AI has a time limit), else it is cancelled. Pondering requires an AI
+    which accepts an ``abort`` argument, like ``Negamax`` or ``PVS``.
+
+    In an ``asyncio`` program, use ``await player.ask_move_async(game)``.
     """
 
-    def __init__(self, AI_algo, name="AI"):
+    def __init__(self, AI_algo, name="AI", ponder=False):
         self.AI_algo = AI_algo
         self.name = name
         self.move = {}
+        if ponder and not accepts_abort(AI_algo):
+            raise ValueError("Pondering requires an AI with an abort argument.")
+        self.ponder = ponder
+        self.pondering = None
+
+    def __getstate__(self):
+        # A background search cannot be copied with the player.
+        state = self.__dict__.copy()
+        state["pondering"] = None
+        return state
 
     def ask_move(self, game):
-        return self.AI_algo(game)
+        move = None
+        if self.pondering is not None:
+            move = self.pondering.finish(game)
+            self.pondering = None
+        if move is None:
+            move = self.AI_algo(game)
+        if self.ponder:
+            self.start_pondering(game, move)
+        return move
+
+    async def ask_move_async(self, game, timeout=None, executor=None):
+        """
+        Returns the AI's move like ``ask_move``, for ``asyncio`` programs:
+        the search runs in a thread of ``executor`` (by default, the default
+        executor of the event loop) while the event loop keeps running.
+
+        The search stops after ``timeout`` seconds (if provided), and the best
+        move found so far is returned. If the awaiting task is cancelled, the
+        search is stopped at its next node, and the cancellation is raised
+        once the thread is free again. This requires an AI which accepts an
+        ``abort`` argument, like ``Negamax`` or ``PVS``. The game must not be
+        modified until the move is returned, and each game needs its own
+        players. Pondering is not used by this method.
+        """
+        if not accepts_abort(self.AI_algo):
+            raise ValueError("ask_move_async requires an AI with an abort argument.")
+        cancelled = threading.Event()
+        deadline = None if (timeout is None) else time.perf_counter() + timeout
+
+        def abort():
+            if cancelled.is_set():
+                return True
+            return (deadline is not None) and (time.perf_counter() > deadline)
+
+        def search():
+            self.stop_pondering()
+            return self.AI_algo(game, abort=abort)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, search)
+        try:
+            # The shield lets the search finish cleanly when the task is cancelled
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancelled.set()
+            await asyncio.wait([future])
+            raise
+
+    def start_pondering(self, game, move):
+        """Starts searching the position expected after ``move`` and the
+        opponent's reply predicted by the AI, if any."""
+        pv = getattr(self.AI_algo, "pv", [])
+        if (len(pv) < 2) or (pv[0] != move):
+            return
+        # A copy without the AIs, whose transposition tables can be large
+        # (imported here: easyAI.AI imports this module).
+        from .AI.SearchResult import search_copy
+
+        expected_game = search_copy(game)
+        for predicted_move in pv[:2]:
+            if expected_game.is_over():
+                return
+            expected_game.play_move(predicted_move)
+        if not expected_game.is_over():
+            self.pondering = Pondering(self.AI_algo, expected_game)
+
+    def stop_pondering(self):
+        """Cancels the background search, if any (e.g. at the end of the
+        game)."""
+        if self.pondering is not None:
+            self.pondering.finish(None)
+            self.pondering = None
+
+
+class Pondering:
+    """
+    A search of the position expected after the opponent's reply, running in
+    a background thread until ``finish`` is called. See ``AI_Player``.
+    """
+
+    def __init__(self, AI_algo, expected_game):
+        self.AI_algo = AI_algo
+        self.game = expected_game
+        self.max_time = getattr(AI_algo, "max_time", None)
+        # The search runs without time limit until the opponent has played.
+        self.ai = copy.copy(AI_algo)
+        self.ai.max_time = None
+        self.cancelled = threading.Event()
+        self.deadline = None
+        self.move = None
+        self.thread = threading.Thread(target=self.search, daemon=True)
+        self.thread.start()
+
+    def abort(self):
+        if self.cancelled.is_set():
+            return True
+        return (self.deadline is not None) and (time.perf_counter() > self.deadline)
+
+    def search(self):
+        self.move = self.ai(self.game, abort=self.abort)
+
+    def finish(self, game):
+        """
+        If ``game`` is the expected position, waits for the end of the search
+        (at most ``max_time`` seconds from now) and returns its move. Else,
+        cancels the search and returns None.
+        """
+        hit = (game is not None) and same_position(game, self.game)
+        if not hit:
+            self.cancelled.set()
+        elif self.max_time is not None:
+            self.deadline = time.perf_counter() + self.max_time
+        self.thread.join()
+        # The AI gets the state of the search (pv, alpha, worker pools...)
+        state = vars(self.ai).copy()
+        state["max_time"] = self.max_time
+        vars(self.AI_algo).update(state)
+        if not hit:
+            return None
+        game.ai_move = self.move
+        return self.move
+
+
+def accepts_abort(AI_algo):
+    """Returns True if the AI algorithm accepts an ``abort`` argument."""
+    return "abort" in inspect.signature(AI_algo).parameters
+
+
+def same_position(game, other_game):
+    """Returns True if the two games are in the same position, comparing
+    their ``ttentry()`` if the games have this method, else their attributes
+    (except the players)."""
+    if hasattr(game, "ttentry"):
+        return game.ttentry() == other_game.ttentry()
+    ignored = {"players", "ai_move", "nmove"}
+    names = (set(vars(game)) | set(vars(other_game))) - ignored
+    return all(
+        np.array_equal(getattr(game, name, None), getattr(other_game, name, None))
+        for name in names
+    )
@@ -21,6 +21,11 @@ class TwoPlayerGame(ABC):
     - ``unmake_move(self, move)``: how to unmake a move (speeds up the AI)
     - ``ttentry(self)``: returns a string/tuple describing the game.
     - ``ttrestore(self, entry)``: use string/tuple from ttentry to restore a game.
+    - ``order_moves(self, moves)``: returns the moves sorted from the most to
+      the least promising (speeds up the AI).
+    - ``iter_moves(self)``: yields the possible moves one by one, the most
+      promising first (e.g. captures), so that the AI does not generate the
+      moves it will never explore (speeds up the AI).
 
     The __init__ method *must* do the following actions:
 
@@ -120,6 +125,10 @@ class TwoPlayerGame(ABC):
 
             self.switch_player()
 
+        for player in self.players:
+            if hasattr(player, "stop_pondering"):
+                player.stop_pondering()
+
         history.append(deepcopy(self))
 
         return history
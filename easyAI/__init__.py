@@ -3,7 +3,17 @@ __all__ = [
     "Human_Player",
     "AI_Player",
     "Negamax",
+    "PVS",
+    "ParallelNegamax",
+    "LazySMP",
+    "YBWC",
     "TranspositionTable",
+    "BoundedTranspositionTable",
+    "SharedTranspositionTable",
+    "ArrayTranspositionTable",
+    "MoveHistory",
+    "ZobristKeys",
+    "SearchResult",
     "solve_with_iterative_deepening",
     "solve_with_depth_first_search",
     "NonRecursiveNegamax",
@@ -12,19 +22,31 @@ __all__ = [
     "DUAL",
     "HashTranspositionTable",
     "DictTranspositionTable",
+    "analyze_many",
 ]
 
 from .TwoPlayerGame import TwoPlayerGame
 from .Player import Human_Player, AI_Player
 from .AI import (
     Negamax,
+    PVS,
+    ParallelNegamax,
+    LazySMP,
+    YBWC,
     solve_with_iterative_deepening,
     solve_with_depth_first_search,
     NonRecursiveNegamax,
     TranspositionTable,
+    BoundedTranspositionTable,
+    SharedTranspositionTable,
+    ArrayTranspositionTable,
+    MoveHistory,
+    ZobristKeys,
+    SearchResult,
     mtd,
     SSS,
     DUAL,
     HashTranspositionTable,
     DictTranspositionTable,
 )
+from .analysis import analyze_many
@@ -0,0 +1,186 @@
+"""
+This module finds the best moves of many positions of a game at once, in a
+pool of worker processes which is kept between batches.
+
+    >>> from functools import partial
+    >>> from easyAI import Negamax, analyze_many
+    >>> ai_factory = partial(Negamax, 8)
+    >>> for result in analyze_many(positions, ai_factory, workers=4):
+    ...     print(result.index, result.move)  # as soon as it is found
+"""
+
+import functools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple
+
+from .AI.parallel import game_for_worker
+
+# State of a worker process, set once by ``init_worker`` when it starts.
+_worker = {}
+
+# The ``Analyzer`` of the last ``analyze_many`` call, kept for the next one.
+_analyzer = {}
+
+
+class Analysis(NamedTuple):
+    """The best move found for a position of a batch."""
+
+    index: int  # index of the position in the batch
+    move: object  # best move found by the AI
+    value: object  # score of the move (``ai.alpha``), None if unknown
+    pv: tuple  # principal variation, empty if unknown
+    time: float  # duration of the search, in seconds
+
+
+class ReadOnlyTable:
+    """
+    A view of a transposition table which gives its entries to the AI but
+    ignores the entries that the AI stores, so that the table stays the same
+    whatever the positions analyzed before (and uses no more memory).
+    """
+
+    def __init__(self, tt):
+        self.tt = tt
+
+    def lookup(self, game):
+        """Requests the entry in the table (see ``TranspositionTable``)."""
+        return self.tt.lookup(game)
+
+    def __call__(self, game):
+        """Returns the move stored for this game."""
+        return self.tt(game)
+
+    def store(self, **data):
+        """Does nothing: the table is read-only."""
+
+
+def make_ai(ai_factory, tt=None):
+    """Creates an AI with ``ai_factory()``, using ``tt`` (read-only) as its
+    transposition table if it is provided."""
+    ai = ai_factory()
+    if tt is not None:
+        ai.tt = ReadOnlyTable(tt)
+    return ai
+
+
+def init_worker(ai_factory, tt=None):
+    """Initializes a worker process with its AI, which is kept from one
+    position to the next."""
+    _worker["ai"] = make_ai(ai_factory, tt)
+
+
+def analyze(ai, index, game):
+    """Returns the ``Analysis`` of a position by the AI."""
+    start = time.perf_counter()
+    move = ai(game)
+    return Analysis(
+        index=index,
+        move=move,
+        value=getattr(ai, "alpha", None),
+        pv=tuple(getattr(ai, "pv", None) or ()),
+        time=time.perf_counter() - start,
+    )
+
+
+def analyze_in_worker(index, game):
+    """Analyzes a position with the AI of the worker process."""
+    return analyze(_worker["ai"], index, game)
+
+
+class Analyzer:
+    """
+    A pool of worker processes which find the best moves of positions of a
+    game. The workers are started at the first batch and kept for the next
+    ones, until ``close()`` is called.
+
+    Parameters
+    -----------
+
+    ai_factory:
+      A function f() -> AI algorithm, e.g. ``functools.partial(Negamax, 8)``.
+      Each worker creates its AI once and keeps it from one position to the
+      next. It is sent to the workers, so it must be picklable (a
+      module-level function, a class or a ``functools.partial``).
+
+    workers:
+      Number of worker processes (by default, the number of CPUs). With one
+      worker the positions are analyzed in the current process.
+
+    tt:
+      A transposition table (e.g. an opening book) loaded once in each
+      worker when it starts, rather than sent with every position. The AIs
+      read it but do not store new entries in it, so that the result of a
+      position does not depend on the positions analyzed before.
+    """
+
+    def __init__(self, ai_factory, workers=None, tt=None):
+        self.ai_factory = ai_factory
+        self.workers = workers if workers else os.cpu_count()
+        self.tt = tt
+        self.ai = None
+        self.executor = None
+
+    def analyze_many(self, positions):
+        """Analyzes the positions (games) and yields an ``Analysis`` for each
+        position as soon as it is found, in any order (see ``index``)."""
+        positions = [game_for_worker(game) for game in positions]
+        if self.workers == 1:
+            if self.ai is None:
+                self.ai = make_ai(self.ai_factory, self.tt)
+            for index, game in enumerate(positions):
+                yield analyze(self.ai, index, game)
+            return
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                self.workers,
+                initializer=init_worker,
+                initargs=(self.ai_factory, self.tt),
+            )
+        futures = [
+            self.executor.submit(analyze_in_worker, index, game)
+            for index, game in enumerate(positions)
+        ]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # If the batch is abandoned, its remaining positions are dropped
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        """Stops the worker processes (they restart at the next batch)."""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+
+def factory_key(ai_factory):
+    """Returns a description of an AI factory which is equal for equal
+    ``functools.partial`` factories, even if they are different objects."""
+    if isinstance(ai_factory, functools.partial):
+        keywords = tuple(sorted(ai_factory.keywords.items()))
+        return (ai_factory.func, ai_factory.args, keywords)
+    return ai_factory
+
+
+def analyze_many(positions, ai_factory, workers=None, tt=None):
+    """
+    Finds the best moves of many positions of a game in parallel, and yields
+    an ``Analysis`` (with the ``index`` of the position, the ``move``...)
+    for each position as soon as it is found.
+
+    The worker processes are kept after the batch, and reused by the next
+    call with the same ``ai_factory`` (or an equal ``functools.partial``),
+    ``workers`` and ``tt``. See
+    ``Analyzer`` for the parameters, and to manage several pools.
+    """
+    key = (factory_key(ai_factory), workers, id(tt))
+    if _analyzer.get("key") != key:
+        if "analyzer" in _analyzer:
+            _analyzer["analyzer"].close()
+        _analyzer.update(key=key, analyzer=Analyzer(ai_factory, workers, tt))
+    return _analyzer["analyzer"].analyze_many(positions)
@@ -0,0 +1,221 @@
+"""
+This module plays tournaments between AIs: many games played in parallel by
+a pool of worker processes, with statistics on the results.
+
+    >>> from easyAI import Negamax, SSS
+    >>> from easyAI.arena import tournament, Standings
+    >>> from easyAI.games import ConnectFour
+    >>> ais = {"negamax 6": Negamax(6), "sss 6": SSS(6)}
+    >>> standings = Standings()
+    >>> for result in tournament(ConnectFour, ais, n_games=20):
+    ...     standings.add(result)  # results arrive as games finish
+    >>> print(standings)
+"""
+
+import copy
+import itertools
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import NamedTuple
+
+from .Player import AI_Player
+
+
+class GameResult(NamedTuple):
+    """The result of a game of a tournament."""
+
+    players: tuple  # names of the first and second players
+    winner: object  # name of the winner, or None for a draw
+    plies: int  # number of moves played
+    move_times: tuple  # durations of the moves of each player, in seconds
+    opening: tuple  # moves played before the AIs took over
+
+
+def game_winner(game):
+    """
+    Returns the index (1 or 2) of the winner of a finished game, or 0 for a
+    draw. The game's ``lose()`` or ``win()`` methods are used if possible
+    (they tell whether the player to move has lost or won), else the sign of
+    ``game.scoring()``.
+    """
+    if hasattr(game, "lose") and game.lose():
+        return game.opponent_index
+    if hasattr(game, "win") and game.win():
+        return game.current_player
+    score = game.scoring() if hasattr(game, "scoring") else 0
+    if score > 0:
+        return game.current_player
+    if score < 0:
+        return game.opponent_index
+    return 0
+
+
+def play_game(
+    game_class,
+    names,
+    ai_algos,
+    game_params=None,
+    opening=(),
+    max_moves=1000,
+    judge=None,
+):
+    """
+    Plays one game between two AIs and returns a ``GameResult``. The moves of
+    ``opening`` are played first. A game which is not over after
+    ``max_moves`` moves is a draw.
+    """
+    players = [AI_Player(ai_algo, name) for ai_algo, name in zip(ai_algos, names)]
+    game = game_class(players, **(game_params or {}))
+    for move in opening:
+        game.play_move(move)
+    move_times = ([], [])
+    plies = 0
+    while (plies < max_moves) and not game.is_over():
+        start = time.perf_counter()
+        move = game.player.ask_move(game)
+        move_times[game.current_player - 1].append(time.perf_counter() - start)
+        game.play_move(move)
+        plies += 1
+    if game.is_over():
+        winner = (judge or game_winner)(game)
+    else:
+        winner = 0
+    return GameResult(
+        players=tuple(names),
+        winner=names[winner - 1] if winner else None,
+        plies=plies,
+        move_times=move_times,
+        opening=tuple(opening),
+    )
+
+
+def tournament(
+    game_class,
+    ai_algos,
+    n_games=10,
+    workers=None,
+    game_params=None,
+    openings=None,
+    max_moves=1000,
+    judge=None,
+):
+    """
+    Plays games between every pair of AIs, in parallel, and yields a
+    ``GameResult`` for each game as soon as it is finished.
+
+    Parameters
+    -----------
+
+    game_class:
+      The game class, or any function f(players, **game_params) -> game.
+
+    ai_algos:
+      A dictionary {name: AI algorithm}, e.g. ``{"negamax": Negamax(6),
+      "sss": SSS(6)}``. Each game gets its own copy of the AIs, so they must
+      be picklable (with module-level scoring functions, not lambdas).
+
+    n_games:
+      Number of games between each pair of AIs. The AIs alternate colors:
+      each one plays half of these games as first player.
+
+    workers:
+      Number of worker processes (by default, the number of CPUs). With one
+      worker the games are played in the current process.
+
+    game_params:
+      Keyword arguments for the creation of each game.
+
+    openings:
+      A list of openings (lists of moves) played at the start of the games,
+      to vary them: each opening is played twice in a row, once with each
+      color.
+
+    max_moves:
+      Number of moves after which an unfinished game is a draw.
+
+    judge:
+      A function f(game) -> 1, 2 or 0 giving the winner of a finished game
+      (0 for a draw), if ``game_winner`` is not appropriate for the game.
+    """
+    matches = []
+    for first, second in itertools.combinations(ai_algos, 2):
+        for i in range(n_games):
+            names = (first, second) if (i % 2 == 0) else (second, first)
+            opening = openings[(i // 2) % len(openings)] if openings else ()
+            ais = tuple(ai_algos[name] for name in names)
+            args = (game_class, names, ais, game_params, opening, max_moves, judge)
+            matches.append(args)
+
+    workers = workers if workers else os.cpu_count()
+    if workers == 1:
+        for args in matches:
+            # Like the pickling for worker processes, the AIs are copied so
+            # that their tables and histories do not carry over between games.
+            yield play_game(*copy.deepcopy(args))
+        return
+
+    executor = ProcessPoolExecutor(workers)
+    try:
+        pending = {executor.submit(play_game, *args) for args in matches}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+class Standings:
+    """
+    Statistics of the results of a tournament: for each AI the number of
+    wins, draws and losses, the mean number of moves of its games and the
+    mean duration of its moves. Results are added one by one with ``add``, and
+    ``print(standings)`` shows a table.
+    """
+
+    def __init__(self, results=()):
+        self.stats = {}
+        for result in results:
+            self.add(result)
+
+    def add(self, result):
+        """Adds the result of a game (a ``GameResult``)."""
+        for name, times in zip(result.players, result.move_times):
+            stats = self.stats.setdefault(
+                name,
+                {"wins": 0, "draws": 0, "losses": 0, "plies": 0, "move_times": []},
+            )
+            if result.winner is None:
+                stats["draws"] += 1
+            elif result.winner == name:
+                stats["wins"] += 1
+            else:
+                stats["losses"] += 1
+            stats["plies"] += result.plies
+            stats["move_times"].extend(times)
+
+    def mean_move_time(self, name):
+        """Mean duration of the moves of an AI, in seconds."""
+        times = self.stats[name]["move_times"]
+        return sum(times) / len(times) if times else 0
+
+    def __str__(self):
+        header = ("AI", "wins", "draws", "losses", "plies", "move time")
+        lines = ["%-20s %6s %6s %6s %8s %10s" % header]
+        for name, stats in sorted(
+            self.stats.items(), key=lambda item: -item[1]["wins"]
+        ):
+            games = stats["wins"] + stats["draws"] + stats["losses"]
+            lines.append(
+                "%-20s %6d %6d %6d %8.1f %9.3fs"
+                % (
+                    name,
+                    stats["wins"],
+                    stats["draws"],
+                    stats["losses"],
+                    stats["plies"] / games,
+                    self.mean_move_time(name),
+                )
+            )
+        return "\n".join(lines)
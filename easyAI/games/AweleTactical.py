@@ -78,6 +78,24 @@ class AweleTactical(TwoPlayerGame):
 
         return ["abcdefghijkl"[u] for u in moves]
 
+    def noisy_moves(self):
+        """
+        The moves which capture seeds. Optional, used by the quiescence
+        search of the AI to avoid stopping the search in the middle of a
+        series of captures.
+        """
+        entry = self.ttentry()
+        noisy_moves = []
+        for move in self.possible_moves():
+            if move == "None":
+                continue
+            score = self.player.score
+            self.make_move(move)
+            if self.player.score > score:
+                noisy_moves.append(move)
+            self.ttrestore(entry)
+        return noisy_moves
+
     def show(self):
         """ Prints the board, with the hole's respective letters """
 
@@ -25,6 +25,10 @@ class ConnectFour(TwoPlayerGame):
     def possible_moves(self):
         return [i for i in range(7) if (self.board[:, i].min() == 0)]
 
+    def order_moves(self, moves):  # optional, speeds up the AI
+        """ Central columns first, they are part of more lines of four """
+        return sorted(moves, key=lambda column: abs(3 - column))
+
     def make_move(self, column):
         line = np.argmin(self.board[:, column] != 0)
         self.board[line, column] = self.current_player
@@ -39,6 +39,18 @@ class Hexapawn(TwoPlayerGame):
 
         return list(map(to_string, [(i, j) for i, j in moves]))
 
+    def iter_moves(self):  # optional, lets the AI generate the moves lazily
+        """ Yields the captures first, then the other moves """
+        opponent_pawns = self.opponent.pawns
+        d = self.player.direction
+        for i, j in self.player.pawns:
+            for target in [(i + d, j + 1), (i + d, j - 1)]:
+                if target in opponent_pawns:
+                    yield to_string(((i, j), target))
+        for i, j in self.player.pawns:
+            if (i + d, j) not in opponent_pawns:
+                yield to_string(((i, j), (i + d, j)))
+
     def make_move(self, move):
         move = list(map(to_tuple, move.split(" ")))
         ind = self.player.pawns.index(move[0])
@@ -49,7 +61,7 @@ class Hexapawn(TwoPlayerGame):
 
     def lose(self):
         return any([i == self.opponent.goal_line for i, j in self.opponent.pawns]) or (
-            self.possible_moves() == []
+            next(self.iter_moves(), None) is None
         )
 
     def is_over(self):
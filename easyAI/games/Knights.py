@@ -1,5 +1,5 @@
 import numpy as np
-from easyAI import TwoPlayerGame
+from easyAI import TwoPlayerGame, ZobristKeys
 
 
 # directions in which a knight can move
@@ -20,6 +20,9 @@ class Knights(TwoPlayerGame):
     Each player has a chess knight (that moves in "L") on a chessboard.
     Each turn the player moves the knight to any tile that hasn't been
     occupied by a knight before. The first player that cannot move loses.
+
+    The position has a Zobrist key ``self.zobrist`` (see ``ZobristKeys``),
+    updated at each move, which the transposition tables use.
     """
 
     def __init__(self, players, board_size=(8, 8)):
@@ -31,6 +34,8 @@ class Knights(TwoPlayerGame):
         players[0].pos = np.array([0, 0])
         players[1].pos = np.array([board_size[0] - 1, board_size[1] - 1])
         self.current_player = 1  # player 1 starts.
+        self.zobrist_keys = ZobristKeys(board_size, 4)
+        self.zobrist = self.zobrist_keys.hash(self.board)
 
     def possible_moves(self):
         endings = [self.player.pos + d for d in DIRECTIONS]
@@ -44,12 +49,35 @@ class Knights(TwoPlayerGame):
             and self.board[e[0], e[1]] == 0  # inside the board
         ]  # and not blocked
 
+    def move_index(self, pos):
+        """Index of a move (its direction), for the compact transposition
+        tables (see ``ArrayTranspositionTable``)."""
+        delta = string2pos(pos) - self.player.pos
+        return next(i for i, d in enumerate(DIRECTIONS) if (d == delta).all())
+
+    def index_move(self, index):
+        """Move of an index given by ``move_index``, or None if this move is
+        not possible."""
+        if index >= len(DIRECTIONS):
+            return None
+        e = self.player.pos + DIRECTIONS[index]
+        if (
+            (0 <= e[0] < self.board_size[0])
+            and (0 <= e[1] < self.board_size[1])
+            and self.board[e[0], e[1]] == 0
+        ):
+            return pos2string(e)
+        return None
+
     def make_move(self, pos):
+        keys, player = self.zobrist_keys, self.current_player
         pi, pj = self.player.pos
         self.board[pi, pj] = 3  # 3 means blocked
+        self.zobrist ^= keys[pi, pj, player] ^ keys[pi, pj, 3]
         self.player.pos = string2pos(pos)
         pi, pj = self.player.pos
-        self.board[pi, pj] = self.current_player  # place player on board
+        self.board[pi, pj] = player  # place player on board
+        self.zobrist ^= keys[pi, pj, player]
 
     def ttentry(self):
         e = [tuple(row) for row in self.board]
@@ -63,6 +91,7 @@ class Knights(TwoPlayerGame):
                 self.board[x, y] = n
         self.players[0].pos = string2pos(entry[-2])
         self.players[1].pos = string2pos(entry[-1])
+        self.zobrist = self.zobrist_keys.hash(self.board)
 
     def show(self):
         print(
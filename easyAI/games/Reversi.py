@@ -40,6 +40,38 @@ class Reversi(TwoPlayerGame):
             and (pieces_flipped(self.board, (i, j), self.current_player) != [])
         ]
 
+    def iter_moves(self):  # optional, lets the AI generate the moves lazily
+        """ Yields the possible moves, corners first, then borders, etc. """
+        for i, j in SQUARES_BY_PRIORITY:
+            if (self.board[i, j] == 0) and pieces_flipped(
+                self.board, (i, j), self.current_player
+            ):
+                yield to_string((i, j))
+
+    def order_moves(self, moves):  # optional, speeds up the AI
+        """ Corners first, then borders, then the rest of the board """
+        return sorted(moves, key=SQUARE_PRIORITY.__getitem__)
+
+    def noisy_moves(self):  # optional, for the quiescence search of the AI
+        """ Taking a corner can swing the game, it is not a quiet move """
+        return [move for move in self.possible_moves() if move in CORNERS]
+
+    def move_index(self, move):  # optional, for compact transposition tables
+        """ Index of a move, from 0 to 63 """
+        i, j = to_array(move)
+        return int(8 * i + j)
+
+    def index_move(self, index):  # optional, for compact transposition tables
+        """ Move of an index given by move_index, None if it is not possible """
+        i, j = divmod(index, 8)
+        if (
+            (i < 8)
+            and (self.board[i, j] == 0)
+            and pieces_flipped(self.board, (i, j), self.current_player)
+        ):
+            return to_string((i, j))
+        return None
+
     def make_move(self, pos):
         """Put the piece at position ``pos`` and flip the pieces that
         much be flipped"""
@@ -72,7 +104,7 @@ class Reversi(TwoPlayerGame):
         may not be the actual rule but it is simpler to code :). Of
         course it would be possible to implement that a player can pass
         if it cannot play (by adding the move 'pass')"""
-        return self.possible_moves() == []
+        return next(self.iter_moves(), None) is None
 
     def scoring(self):
         """
@@ -105,6 +137,17 @@ BOARD_SCORE = np.array(
     ]
 )
 
+# Used to explore the moves on the corners and borders first
+SQUARE_PRIORITY = {
+    to_string((i, j)): -BOARD_SCORE[i, j] for i in range(8) for j in range(8)
+}
+
+SQUARES_BY_PRIORITY = sorted(
+    [(i, j) for i in range(8) for j in range(8)], key=lambda ij: -BOARD_SCORE[ij]
+)
+
+CORNERS = ["A1", "A8", "H1", "H8"]
+
 DIRECTIONS = [
     np.array([i, j]) for i in [-1, 0, 1] for j in [-1, 0, 1] if (i != 0 or j != 0)
 ]
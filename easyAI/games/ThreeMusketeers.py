@@ -1,12 +1,17 @@
 import numpy as np
-from easyAI import TwoPlayerGame
+from easyAI import TwoPlayerGame, ZobristKeys
 
 MOVES = np.zeros((30, 4), dtype=int)
+ZOBRIST = ZobristKeys((5, 5), 3)
 
 
 class ThreeMusketeers(TwoPlayerGame):
     """
     rules: http://en.wikipedia.org/wiki/Three_Musketeers_%28game%29
+
+    The board has a Zobrist key ``self.board_key`` (see ``ZobristKeys``),
+    updated at each move, from which ``self.zobrist`` (used by the
+    transposition tables) is computed.
     """
 
     def __init__(self, players):
@@ -22,6 +27,7 @@ class ThreeMusketeers(TwoPlayerGame):
         )
         self.musketeers = [(0, 4), (2, 2), (4, 0)]
         self.current_player = 1
+        self.board_key = ZOBRIST.hash(self.board)
 
     def possible_moves(self):
         moves = []
@@ -55,6 +61,7 @@ class ThreeMusketeers(TwoPlayerGame):
 
         self.board[move[0], move[1]] = 0
         self.board[move[2], move[3]] = self.current_player
+        self.board_key ^= self.move_key(move)
         if self.current_player == 1:
             self.musketeers.remove((move[0], move[1]))
             self.musketeers.append((move[2], move[3]))
@@ -66,11 +73,28 @@ class ThreeMusketeers(TwoPlayerGame):
 
         self.board[move[0], move[1]] = self.current_player
         self.board[move[2], move[3]] = 0
+        self.board_key ^= self.move_key(move)
         if self.current_player == 1:
             self.board[move[2], move[3]] = 2
             self.musketeers.remove((move[2], move[3]))
             self.musketeers.append((move[0], move[1]))
 
+    def move_key(self, move):
+        """Returns the change of the Zobrist key of the board made by a move
+        of the current player (a musketeer captures an enemy, an enemy moves
+        to an empty square)."""
+        i, j, k, l = move
+        player = self.current_player
+        key = ZOBRIST[i, j, player] ^ ZOBRIST[k, l, player]
+        if player == 1:
+            key ^= ZOBRIST[k, l, 2]
+        return key
+
+    @property
+    def zobrist(self):
+        """The Zobrist key of the position (board and player to move)."""
+        return self.board_key ^ (ZOBRIST.side if self.current_player == 2 else 0)
+
     def win(self):
         a, b, c = self.musketeers
         aligned = (a[0] == b[0] and b[0] == c[0]) or (a[1] == b[1] and b[1] == c[1])
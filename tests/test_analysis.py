@@ -0,0 +1,41 @@
+from functools import partial
+
+from easyAI import Negamax, TranspositionTable, analysis, analyze_many
+from easyAI.analysis import Analyzer
+from easyAI.games import Nim
+
+
+def test_analyze_many_matches_negamax():
+    positions = [Nim(piles=piles) for piles in [(2, 5), (1, 3), (4, 4, 1), (3, 6)]]
+    expected = [Negamax(6)(game) for game in positions]
+    results = list(analyze_many(positions, partial(Negamax, 6), workers=2))
+    assert sorted(result.index for result in results) == [0, 1, 2, 3]
+    for result in results:
+        assert result.move == expected[result.index]
+        assert result.pv[0] == result.move
+
+
+def test_analyzer_keeps_workers_and_reads_table():
+    table = TranspositionTable()
+    Negamax(6, tt=table)(Nim(piles=(2, 5)))
+    n_entries = len(table.d)
+    analyzer = Analyzer(partial(Negamax, 6), workers=2, tt=table)
+    try:
+        for _ in range(2):
+            results = list(analyzer.analyze_many([Nim(piles=(2, 5))] * 3))
+            assert [result.move for result in results] == ["2,3"] * 3
+        assert analyzer.executor is not None
+    finally:
+        analyzer.close()
+    assert len(table.d) == n_entries
+
+
+def test_analyze_many_reuses_the_pool_for_equal_partials():
+    positions = [Nim(piles=(2, 5))] * 2
+    list(analyze_many(positions, partial(Negamax, 6, win_score=90), workers=2))
+    analyzer = analysis._analyzer["analyzer"]
+    list(analyze_many(positions, partial(Negamax, 6, win_score=90), workers=2))
+    assert analysis._analyzer["analyzer"] is analyzer
+    list(analyze_many(positions, partial(Negamax, 5), workers=2))
+    assert analysis._analyzer["analyzer"] is not analyzer
+    analysis._analyzer["analyzer"].close()
@@ -0,0 +1,41 @@
+from easyAI import Negamax, TranspositionTable
+from easyAI.arena import Standings, tournament
+from easyAI.games import ConnectFour, Nim
+
+
+def test_tournament_alternates_colors_and_collects_results():
+    ai_algos = {"strong": Negamax(8), "weak": Negamax(1), "medium": Negamax(3)}
+    results = list(
+        tournament(Nim, ai_algos, n_games=4, workers=2, game_params={"piles": (2, 5)})
+    )
+    assert len(results) == 3 * 4
+    first_players = [result.players[0] for result in results]
+    assert first_players.count("strong") == first_players.count("weak") == 4
+    standings = Standings(results)
+    assert standings.stats["strong"]["losses"] == 0
+    assert standings.stats["weak"]["wins"] == 0
+    assert all(result.plies > 0 for result in results)
+    assert standings.mean_move_time("strong") > 0
+    assert "strong" in str(standings)
+
+
+def test_tournament_openings_and_unfinished_games():
+    ai_algos = {"a": Negamax(2), "b": Negamax(2)}
+    results = list(
+        tournament(
+            ConnectFour, ai_algos, n_games=2, workers=1, openings=[[0]], max_moves=3
+        )
+    )
+    assert [result.opening for result in results] == [(0,), (0,)]
+    assert [result.winner for result in results] == [None, None]
+    assert [result.plies for result in results] == [3, 3]
+
+
+def test_tournament_gives_each_game_its_own_copy_of_the_ais():
+    table = TranspositionTable()
+    ai_algos = {"a": Negamax(4, tt=table), "b": Negamax(4)}
+    results = list(
+        tournament(Nim, ai_algos, n_games=2, workers=1, game_params={"piles": (2, 5)})
+    )
+    assert len(results) == 2
+    assert len(table) == 0
@@ -1,6 +1,39 @@
-from easyAI import AI_Player, Negamax
-from easyAI.games import ConnectFour, Nim
+import asyncio
+
+import pytest
+
+from easyAI import (
+    AI_Player,
+    DUAL,
+    Human_Player,
+    MoveHistory,
+    Negamax,
+    NonRecursiveNegamax,
+    PVS,
+    SSS,
+    SearchResult,
+    TranspositionTable,
+    solve_with_depth_first_search,
+)
+from easyAI.games import AweleTactical, ConnectFour, Knights, Nim
 import numpy as np
+import time
+
+
+def desperate_connect_four(ai_algo):
+    ai_player = AI_Player(ai_algo)
+    game = ConnectFour(players=[ai_player, ai_player])
+    game.board = np.array(
+        [
+            [1, 1, 2, 2, 0, 0, 0],
+            [1, 2, 2, 2, 0, 0, 0],
+            [1, 0, 1, 0, 0, 0, 0],
+            [2, 0, 0, 0, 0, 0, 0],
+            [1, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0],
+        ]
+    )
+    return game
 
 
 def test_negamax_saves_the_next_turn_even_in_a_desperate_situation():
@@ -36,3 +69,273 @@ def test_nim_strategy_is_good():
     ai_algo = Negamax(6)
     game = Nim(piles=(4, 4))
     assert ai_algo(game) == "1,1"
+
+
+def test_negamax_with_max_time_respects_the_time_budget():
+    ai_algo = Negamax(max_time=0.3)
+    game = ConnectFour(players=[AI_Player(ai_algo), AI_Player(ai_algo)])
+    start = time.perf_counter()
+    move = ai_algo(game)
+    assert time.perf_counter() - start < 1.0
+    assert move in game.possible_moves()
+    assert ai_algo.depth_reached >= 1
+
+
+def test_negamax_with_max_time_stops_at_max_depth():
+    ai_algo = Negamax(6, max_time=1000)
+    game = Nim(piles=(4, 4))
+    assert ai_algo(game) == "1,1"
+    assert ai_algo.depth_reached == 6
+
+
+def test_negamax_with_aspiration_windows_finds_the_same_moves():
+    ai_algo = Negamax(6, aspiration=1)
+    assert ai_algo(desperate_connect_four(ai_algo)) == 1
+    reference = Negamax(6)
+    reference(desperate_connect_four(reference))
+    assert abs(ai_algo.alpha - reference.alpha) < 1e-9
+    ai_algo = Negamax(6, aspiration=1, tt=TranspositionTable())
+    assert ai_algo(Nim(piles=(4, 4))) == "1,1"
+
+
+def test_pvs_finds_the_same_moves_as_negamax():
+    ai_algo = PVS(6)
+    assert ai_algo(desperate_connect_four(ai_algo)) == 1
+    reference = Negamax(6)
+    reference(desperate_connect_four(reference))
+    assert abs(ai_algo.alpha - reference.alpha) < 1e-9
+    for tt in [None, TranspositionTable()]:
+        assert PVS(6, tt=tt)(Nim(piles=(4, 4))) == "1,1"
+
+
+def test_move_history_puts_killers_then_history_first():
+    history = MoveHistory(killers=1)
+    history.record_cutoff("b", ply=0, depth=1)
+    history.record_cutoff([1, 2], ply=3, depth=2)
+    history.record_cutoff("c", ply=3, depth=3)
+    assert history.sort(["a", "b", "c", [1, 2]], ply=3) == ["c", [1, 2], "b", "a"]
+    assert history.sort(["a", "b", "c"], ply=0) == ["b", "c", "a"]
+
+
+def test_engines_with_move_history_find_the_same_scores():
+    for make_ai in [Negamax, PVS, SSS]:
+        reference = make_ai(6)
+        move = reference(desperate_connect_four(reference))
+        ai_algo = make_ai(6, move_history=MoveHistory())
+        assert ai_algo(desperate_connect_four(ai_algo)) == move
+        assert abs(ai_algo.alpha - reference.alpha) < 1e-9
+    results = []
+    for history in [None, MoveHistory()]:
+        ai_algo = NonRecursiveNegamax(7, move_history=history)
+        game = Knights([AI_Player(ai_algo), AI_Player(ai_algo)], (5, 5))
+        results.append((ai_algo(game), ai_algo.alpha))
+    assert results[0] == results[1]
+
+
+def test_ordering_function_is_used_by_every_engine():
+    calls = []
+
+    def reverse_ordering(game, moves):
+        calls.append(len(moves))
+        return moves[::-1]
+
+    for make_ai in [Negamax, SSS]:
+        ai_algo = make_ai(4, ordering=reverse_ordering)
+        game = desperate_connect_four(ai_algo)
+        assert ai_algo(game) == make_ai(4)(desperate_connect_four(ai_algo))
+    ai_algo = NonRecursiveNegamax(4, ordering=reverse_ordering)
+    ai_algo(Knights([AI_Player(ai_algo), AI_Player(ai_algo)], (5, 5)))
+    game = Nim(piles=(2, 2))
+    result = solve_with_depth_first_search(game, 80, ordering=reverse_ordering)
+    assert result == solve_with_depth_first_search(Nim(piles=(2, 2)), 80)
+    assert len(calls) > 100
+
+
+def test_game_order_moves_method_is_used():
+    game = ConnectFour(players=None)
+    assert game.order_moves(game.possible_moves()) == [3, 2, 4, 1, 5, 0, 6]
+    ai_algo = Negamax(4, ordering=lambda game, moves: moves)
+    assert ai_algo(ConnectFour(players=None)) == 0
+    assert Negamax(4)(ConnectFour(players=None)) == 3
+
+
+def test_null_move_pruning_uses_the_game_null_move_methods():
+    class NimWithPass(Nim):
+        null_moves = 0
+
+        def make_null_move(self):
+            NimWithPass.null_moves += 1
+
+        def unmake_null_move(self):
+            pass
+
+        def null_move_allowed(self):
+            return sum(self.piles) > 2
+
+    ai_algo = Negamax(6, null_move=2)
+    assert ai_algo(desperate_connect_four(ai_algo)) == 1
+    ai_algo = PVS(8, null_move=2, tt=TranspositionTable())
+    assert ai_algo(NimWithPass(piles=(4, 4))) == "1,1"
+    assert NimWithPass.null_moves > 0
+
+
+def test_null_move_pruning_with_a_transposition_table():
+    # The keys of Knights positions do not tell the player to move, so the
+    # null-move searches must not use the table.
+    for ai_class in [Negamax, PVS]:
+        for verify in [True, False]:
+            ai_algo = ai_class(
+                7, null_move=2, null_move_verify=verify, tt=TranspositionTable()
+            )
+            game = Knights([AI_Player(ai_algo), AI_Player(ai_algo)], (5, 5))
+            reference = ai_class(7, tt=TranspositionTable())
+            assert ai_algo(game) == reference(game)
+            assert ai_algo.alpha == reference.alpha
+
+
+def test_late_move_reductions_still_find_the_best_moves():
+    for make_ai in [Negamax, PVS]:
+        ai_algo = make_ai(6, move_history=MoveHistory(), lmr_moves=2, lmr_depth=2)
+        assert ai_algo(desperate_connect_four(ai_algo)) == 1
+    ai_algo = Negamax(8, lmr_moves=1, tt=TranspositionTable())
+    assert ai_algo(Nim(piles=(4, 4))) == "1,1"
+
+
+def test_late_move_reductions_skip_noisy_moves():
+    class NoisyNim(Nim):
+        def is_quiet(self, move):
+            return False
+
+    reference = Negamax(8)
+    reference(Nim(piles=(4, 4)))
+    ai_algo = Negamax(8, lmr_moves=1, lmr_depth=2)
+    assert ai_algo(NoisyNim(piles=(4, 4))) == "1,1"
+    assert ai_algo.nodes == reference.nodes  # no move was reduced
+    ai_algo(Nim(piles=(4, 4)))
+    assert ai_algo.nodes != reference.nodes
+    ai_algo = Negamax(4, lmr_moves=1, lmr_depth=2)
+    game = AweleTactical([AI_Player(ai_algo), AI_Player(ai_algo)])
+    assert ai_algo(game) in game.possible_moves()
+    with pytest.raises(ValueError):
+        Negamax(6, lmr_moves=0)
+
+
+def test_quiescence_search_explores_captures_beyond_the_horizon():
+    ai_algo = Negamax(4, quiescence=4)
+    game = AweleTactical([AI_Player(ai_algo), AI_Player(ai_algo)])
+    for move in "cidj":
+        game.play_move(move)
+    assert ai_algo(game) in game.possible_moves()
+    assert ai_algo.nodes > 0 and ai_algo.qnodes > 0
+    ai_algo = Negamax(6, quiescence=4)
+    assert ai_algo(desperate_connect_four(ai_algo)) == 1
+    assert ai_algo.qnodes == 0
+
+
+def test_principal_variation_is_a_legal_line_starting_with_the_best_move():
+    for make_ai in [Negamax, PVS, NonRecursiveNegamax, SSS]:
+        ai_algo = make_ai(5)
+        game = Knights([AI_Player(ai_algo), AI_Player(ai_algo)], board_size=(5, 5))
+        move = ai_algo(game)
+        assert len(ai_algo.pv) == 5
+        assert ai_algo.pv[0] == move
+        for pv_move in ai_algo.pv:
+            assert pv_move in game.possible_moves()
+            game.play_move(pv_move)
+
+
+def test_lazy_move_generation_skips_the_moves_after_a_cutoff():
+    class CountingNim(Nim):
+        generated = 0
+
+        def possible_moves(self):
+            moves = super().possible_moves()
+            CountingNim.generated += len(moves)
+            return moves
+
+    class LazyNim(Nim):
+        generated = 0
+
+        def iter_moves(self):
+            for move in Nim.possible_moves(self):
+                LazyNim.generated += 1
+                yield move
+
+    for make_ai in [Negamax, PVS, SSS]:
+        CountingNim.generated = LazyNim.generated = 0
+        assert make_ai(6)(CountingNim(piles=(4, 4))) == "1,1"
+        assert make_ai(6)(LazyNim(piles=(4, 4))) == "1,1"
+        assert 0 < LazyNim.generated < CountingNim.generated
+
+
+def test_pondering_continues_on_the_expected_reply_and_cancels_otherwise():
+    ai_algo = Negamax(7, tt=TranspositionTable())
+    player = AI_Player(ai_algo, ponder=True)
+    game = Nim([player, Human_Player()], piles=(3, 4, 5))
+    move = player.ask_move(game)
+    assert player.pondering is not None
+    assert player.pondering.game.players[0].AI_algo is None  # no table copy
+    game.play_move(move)
+    game.play_move(ai_algo.pv[1])  # the expected reply: ponder hit
+    move = player.ask_move(game)
+    assert move == Negamax(7)(game.copy())
+    game.play_move(move)
+    unexpected = [m for m in game.possible_moves() if m != ai_algo.pv[1]][0]
+    game.play_move(unexpected)  # ponder miss
+    assert player.ask_move(game) == Negamax(7)(game.copy())
+    player.stop_pondering()
+    assert player.pondering is None
+
+    ai_algo = Negamax(max_time=0.2)
+    game = ConnectFour([AI_Player(ai_algo, ponder=True), AI_Player(Negamax(2))])
+    game.play(verbose=False)
+    assert game.players[0].pondering is None
+
+
+def test_ask_move_async_respects_the_deadline_and_cancellation():
+    async def ask_with_deadline():
+        player = AI_Player(Negamax(30))
+        game = ConnectFour([player, AI_Player(Negamax(2))])
+        start = time.time()
+        move = await player.ask_move_async(game, timeout=0.3)
+        assert move in game.possible_moves()
+        assert time.time() - start < 2
+
+    async def cancel_search():
+        ai_algo = Negamax(30)
+        ai_algo.nodes = None
+        player = AI_Player(ai_algo)
+        game = ConnectFour([player, AI_Player(Negamax(2))])
+        task = asyncio.ensure_future(player.ask_move_async(game))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        assert task.cancelled()
+        assert ai_algo.nodes is not None  # the search has returned
+
+    asyncio.run(ask_with_deadline())
+    asyncio.run(cancel_search())
+
+
+def test_search_returns_a_result_without_modifying_the_game_or_the_ai():
+    from concurrent.futures import ThreadPoolExecutor
+
+    for ai_algo in [Negamax(6), PVS(6), NonRecursiveNegamax(6), SSS(6), DUAL(6)]:
+        game = Knights([AI_Player(ai_algo), AI_Player(ai_algo)], (5, 5))
+        result = ai_algo.search(game)
+        assert isinstance(result, SearchResult)
+        assert not hasattr(game, "ai_move") and not hasattr(ai_algo, "pv")
+        assert result.pv[0] == result.move and result.nodes > 0
+        assert ai_algo(game) == result.move
+        assert (ai_algo.alpha, tuple(ai_algo.pv)) == (result.score, result.pv)
+
+    ai_algo = Negamax(6)
+    game = ConnectFour([AI_Player(ai_algo), AI_Player(ai_algo)])
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(lambda _: ai_algo.search(game), range(4)))
+    assert len(set(results)) == 1
+    assert results[0].move == ai_algo(game)
+    assert results[0].depth == ai_algo.depth_reached == 6
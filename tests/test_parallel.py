@@ -0,0 +1,123 @@
+import pytest
+
+from easyAI import (
+    AI_Player,
+    ArrayTranspositionTable,
+    LazySMP,
+    Negamax,
+    ParallelNegamax,
+    SharedTranspositionTable,
+    TranspositionTable,
+    YBWC,
+    solve_with_depth_first_search,
+)
+from easyAI.games import ConnectFour, Knights, Nim
+import pickle
+
+
+def test_parallel_searches_play_like_negamax():
+    for game_class, depth in [(ConnectFour, 5), (Knights, 5)]:
+        results = []
+        for ai_algo in [
+            Negamax(depth),
+            ParallelNegamax(depth, workers=3),
+            YBWC(depth, workers=3),
+            YBWC(depth, workers=2, split_plies=1),
+            ParallelNegamax(depth, workers=3, threads=True),
+            YBWC(depth, workers=3, threads=True),
+        ]:
+            game = game_class([AI_Player(ai_algo), AI_Player(ai_algo)])
+            results.append((ai_algo(game), ai_algo.alpha, ai_algo.pv[0]))
+            if hasattr(ai_algo, "close"):
+                ai_algo.close()
+        assert all(result == results[0] for result in results)
+
+
+def test_lazy_smp_with_threads_shares_the_table_of_the_ai():
+    table = TranspositionTable()
+    scoring = lambda game: game.scoring()  # threads need no pickling
+    ai_algo = LazySMP(6, scoring, tt=table, workers=3, threads=True)
+    assert ai_algo(Nim(piles=(2, 5))) == "2,3"
+    assert len(table.d) > 0
+    ai_algo.close()
+    assert ai_algo.tt is table
+
+    ai_algo = ParallelNegamax(4, workers=2, threads=True, tt=ArrayTranspositionTable())
+    with pytest.raises(ValueError):
+        ai_algo(Nim(piles=(2, 5)))  # not safe to share between threads
+
+
+def test_parallel_negamax_with_unmake_move_tt_and_time_limit():
+    ai_algo = ParallelNegamax(8, workers=2, tt=TranspositionTable())
+    game = Nim(piles=(2, 5))
+    assert ai_algo(game) == "2,3"
+    assert game.piles == [2, 5]
+    assert ai_algo.nodes > 0
+    ai_algo.close()
+
+    ai_algo = ParallelNegamax(None, workers=2, max_time=1)
+    game = ConnectFour([AI_Player(ai_algo), AI_Player(ai_algo)])
+    assert ai_algo(game) in game.possible_moves()
+    assert ai_algo.depth_reached > 1
+    copy = pickle.loads(pickle.dumps(ai_algo))  # without its worker processes
+    assert copy.pool is None
+    ai_algo.close()
+
+
+def test_shared_transposition_table_is_shared_by_pickled_copies():
+    table = SharedTranspositionTable(1024)
+    game = Nim(piles=(4, 4))
+    table.store(game=game, depth=3, value=-100.5, move="1,2", flag=1)
+    other_table = pickle.loads(pickle.dumps(table))
+    assert other_table.lookup(game) == {
+        "value": -100.5,
+        "depth": 3,
+        "flag": 1,
+        "move": "1,2",
+    }
+    assert other_table.lookup(Nim(piles=(4, 3))) is None
+    other_table.close()
+    table.close()
+
+
+def test_lazy_smp_plays_like_negamax():
+    ai_algo = LazySMP(8, workers=3)
+    assert ai_algo(Nim(piles=(2, 5))) == "2,3"
+    ai_algo.close()
+
+    results = []
+    for ai_algo in [LazySMP(6, workers=2), LazySMP(6, workers=2, max_time=30)]:
+        game = Knights([AI_Player(ai_algo), AI_Player(ai_algo)], board_size=(6, 6))
+        results.append(ai_algo(game))
+        ai_algo.close()
+    game = Knights([AI_Player(None), AI_Player(None)], board_size=(6, 6))
+    assert results[0] == results[1] == Negamax(6)(game)
+
+
+def test_ybwc_with_unmake_move_tt_and_time_limit():
+    ai_algo = YBWC(8, workers=2, tt=TranspositionTable())
+    game = Nim(piles=(2, 5))
+    assert ai_algo(game) == "2,3"
+    assert game.piles == [2, 5]
+    ai_algo.close()
+
+    ai_algo = YBWC(None, workers=2, max_time=1, tt=SharedTranspositionTable())
+    game = Knights([AI_Player(ai_algo), AI_Player(ai_algo)], board_size=(6, 6))
+    assert ai_algo(game) in game.possible_moves()
+    assert ai_algo.depth_reached > 1
+    ai_algo.close()
+    ai_algo.tt.close()
+
+
+def test_solving_in_parallel_gives_the_same_results():
+    for piles in [(2, 2), (3, 4), (1, 2, 3), (2, 3, 4)]:
+        expected = solve_with_depth_first_search(Nim(piles=piles), 80)
+        for split_depth in [1, 3]:
+            result = solve_with_depth_first_search(
+                Nim(piles=piles), 80, workers=2, split_depth=split_depth
+            )
+            assert result == expected
+    game = Knights([AI_Player(None), AI_Player(None)], board_size=(4, 4))
+    table = TranspositionTable()
+    assert solve_with_depth_first_search(game, 80, tt=table, workers=3) == -1
+    assert table.lookup(game)["value"] == -1
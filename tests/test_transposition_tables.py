@@ -0,0 +1,249 @@
+import pickle
+import random
+
+import pytest
+
+from easyAI import (
+    AI_Player,
+    ArrayTranspositionTable,
+    BoundedTranspositionTable,
+    Negamax,
+    SSS,
+    TranspositionTable,
+    ZobristKeys,
+    solve_with_depth_first_search,
+)
+from easyAI.games import Knights, Nim, ThreeMusketeers
+
+
+def store(table, piles, depth):
+    table.store(game=Nim(piles=piles), depth=depth, value=0, move="1,1", flag=0)
+
+
+def test_bounded_table_never_exceeds_its_size():
+    for policy in ["always", "depth", "two-tier"]:
+        table = BoundedTranspositionTable(64, policy=policy)
+        for i in range(1000):
+            store(table, (i, i + 1), depth=i % 5)
+        assert 0 < len(table) <= 64
+    with pytest.raises(ValueError):
+        BoundedTranspositionTable(64, policy="never")
+    with pytest.raises(ValueError):
+        BoundedTranspositionTable(1, policy="two-tier")
+
+
+def test_bounded_table_with_the_solving_functions():
+    # The entries of the solver have no depth.
+    for piles in [(2, 3), (2, 5), (3, 4, 1)]:
+        expected = solve_with_depth_first_search(Nim(piles=piles), 80)
+        for policy in ["always", "depth", "two-tier"]:
+            table = BoundedTranspositionTable(4, policy=policy)
+            result = solve_with_depth_first_search(Nim(piles=piles), 80, tt=table)
+            assert result == expected
+
+
+def test_bounded_table_replacement_policies():
+    deep, shallow = Nim(piles=(1, 2)), Nim(piles=(3, 4))
+    for policy, kept in [("always", [1]), ("depth", [0]), ("two-tier", [0, 1])]:
+        # A table with a single place: both positions compete for it.
+        table = BoundedTranspositionTable(len(kept), policy=policy)
+        store(table, deep.piles, depth=5)
+        store(table, shallow.piles, depth=2)
+        found = [table.lookup(game) is not None for game in [deep, shallow]]
+        assert found == [(i in kept) for i in range(2)]
+        store(table, deep.piles, depth=1)  # same position: always replaced
+        if 0 in kept:
+            assert table.lookup(deep)["depth"] == 1
+
+
+def test_bounded_table_gives_the_same_scores_and_survives_pickling():
+    for ai_class in [Negamax, SSS]:
+        table = BoundedTranspositionTable(512)
+        ai_algo, reference = ai_class(6, tt=table), ai_class(6)
+        game = Knights([AI_Player(ai_algo), AI_Player(ai_algo)], (5, 5))
+        ai_algo(game), reference(game)
+        assert ai_algo.alpha == reference.alpha
+        assert 0 < len(table) <= 512
+        copy = pickle.loads(pickle.dumps(table))
+        assert copy.d == table.d
+        assert copy.lookup(game) == table.lookup(game) is not None
+
+
+def full_zobrist_key(game):
+    if isinstance(game, Knights):
+        return game.zobrist_keys.hash(game.board)
+    keys = ZobristKeys((5, 5), 3)
+    return keys.hash(game.board) ^ (keys.side if game.current_player == 2 else 0)
+
+
+def test_zobrist_keys_are_updated_incrementally():
+    rng = random.Random(0)
+    for game_class in [Knights, ThreeMusketeers]:
+        game = game_class([AI_Player(None), AI_Player(None)])
+        keys, entries = {}, {}
+        for _ in range(20):
+            if game.is_over():
+                break
+            assert game.zobrist == full_zobrist_key(game)
+            keys[game.ttentry()] = game.zobrist
+            entries[game.zobrist] = game.ttentry()
+            move = rng.choice(game.possible_moves())
+            if hasattr(game, "unmake_move"):
+                key = game.zobrist
+                game.make_move(move)
+                game.switch_player()
+                game.switch_player()
+                game.unmake_move(move)
+                assert game.zobrist == key
+            game.play_move(move)
+        assert len(keys) == len(entries) > 5  # one key per position
+
+
+def test_tables_use_zobrist_keys():
+    game = ThreeMusketeers([AI_Player(None), AI_Player(None)])
+    for table in [TranspositionTable(), BoundedTranspositionTable(1024)]:
+        ai_algo, reference = Negamax(4, tt=table), Negamax(4)
+        assert ai_algo(game) == reference(game)
+        assert ai_algo.alpha == reference.alpha
+        assert table.lookup(game)["move"] == ai_algo.pv[0]
+        assert all(isinstance(key, int) for key in table.d)
+
+
+def test_array_table_finds_the_same_results(tmp_path):
+    table = ArrayTranspositionTable(4096)
+    ai_algo, reference = Negamax(7, tt=table), Negamax(7)
+    game = Knights([AI_Player(ai_algo), AI_Player(ai_algo)], (5, 5))
+    assert ai_algo(game) == reference(game)
+    assert ai_algo.alpha == reference.alpha
+    assert 0 < len(table) <= 4096
+    assert table(game) == ai_algo.pv[0]
+    assert table.entries.nbytes == 16 * 4096
+
+    table.to_file(tmp_path / "table.npy")
+    loaded = ArrayTranspositionTable(16)
+    loaded.from_file(tmp_path / "table.npy")
+    assert loaded.lookup(game) == table.lookup(game)
+
+    table = ArrayTranspositionTable(1024)
+    assert solve_with_depth_first_search(Nim(piles=(2, 5)), 80, tt=table) == 1
+    assert table(Nim(piles=(2, 5))) == "2,3"
+
+
+def test_array_table_replaces_the_shallowest_entry_when_full():
+    table = ArrayTranspositionTable(2, probes=2)
+    for piles, depth in [((1, 2), 5), ((3, 4), 1), ((5, 6), 3)]:
+        store(table, piles, depth)
+    assert table.lookup(Nim(piles=(1, 2)))["depth"] == 5
+    assert table.lookup(Nim(piles=(3, 4))) is None
+    assert table.lookup(Nim(piles=(5, 6)))["depth"] == 3
+
+
+def test_array_table_uses_all_its_slots():
+    for size in [4096, 4000]:
+        table = ArrayTranspositionTable(size)
+        all_piles = [(i, j) for i in range(1, 61) for j in range(1, 61)]
+        for piles in all_piles:
+            store(table, piles, depth=0)
+        assert len(table) > 0.7 * len(all_piles)
+        found = [table.lookup(Nim(piles=piles)) for piles in all_piles]
+        assert len(found) - found.count(None) == len(table)
+
+
+def test_compact_tables_use_the_move_index_methods_of_the_game():
+    class CountingKnights(Knights):
+        calls = 0
+
+        def possible_moves(self):
+            CountingKnights.calls += 1
+            return Knights.possible_moves(self)
+
+    ai_algo = Negamax(1)
+    game = CountingKnights([AI_Player(ai_algo), AI_Player(ai_algo)], (5, 5))
+    table = ArrayTranspositionTable(64)
+    for move in game.possible_moves():
+        assert game.index_move(game.move_index(move)) == move
+    CountingKnights.calls = 0
+    for move in game.possible_moves():
+        table.store(game=game, value=1, depth=2, move=move)
+        assert table(game) == move
+    assert CountingKnights.calls == 1
+
+
+def test_array_table_mapped_from_a_file(tmp_path):
+    filename = str(tmp_path / "table.npy")
+    table = ArrayTranspositionTable(4096, filename=filename)
+    ai_algo = Negamax(7, tt=table)
+    game = Knights([AI_Player(ai_algo), AI_Player(ai_algo)], (5, 5))
+    move = ai_algo(game)
+    table.flush()
+
+    mapped = ArrayTranspositionTable(0)
+    mapped.from_file(filename, mmap_mode="r")
+    assert len(mapped) == len(table)
+    assert mapped(game) == move
+    mapped.store(game=game, value=0, move=None, depth=100)  # ignored
+    assert mapped.lookup(game) == table.lookup(game)
+
+    copy = pickle.loads(pickle.dumps(mapped))
+    assert len(pickle.dumps(mapped)) < 1000  # only the name of the file
+    assert copy.lookup(game) == table.lookup(game)
+    assert Negamax(7, tt=copy)(game) == move
+
+
+def test_tables_prune_the_entries_of_old_searches():
+    tables = [
+        TranspositionTable(),
+        BoundedTranspositionTable(64, policy="depth"),
+        ArrayTranspositionTable(64),
+    ]
+    for table in tables:
+        ai_algo = Negamax(3, tt=table)
+        game = Knights([AI_Player(ai_algo), AI_Player(ai_algo)], (5, 5))
+        ai_algo(game)
+        assert table.generation == 1
+        store(table, (1, 2), depth=0)
+        table.new_search()
+        store(table, (3, 4), depth=0)
+        table.prune_older_than(table.generation)
+        assert len(table) == 1
+        assert table.lookup(Nim(piles=(1, 2))) is None
+        assert table.lookup(Nim(piles=(3, 4))) is not None
+
+
+def test_entries_of_old_searches_are_replaced_first():
+    table = BoundedTranspositionTable(1, policy="depth")
+    store(table, (1, 2), depth=5)
+    store(table, (3, 4), depth=2)
+    assert table.lookup(Nim(piles=(3, 4))) is None
+    table.new_search()
+    store(table, (3, 4), depth=2)
+    assert table.lookup(Nim(piles=(3, 4))) is not None
+
+    table = ArrayTranspositionTable(2, probes=2)
+    store(table, (1, 2), depth=5)
+    table.new_search()
+    for piles, depth in [((3, 4), 1), ((5, 6), 3)]:
+        store(table, piles, depth)
+    assert table.lookup(Nim(piles=(1, 2))) is None
+    assert table.lookup(Nim(piles=(3, 4)))["depth"] == 1
+
+
+def test_array_table_saves_its_generation(tmp_path):
+    filename = str(tmp_path / "table.npy")
+    table = ArrayTranspositionTable(64, filename=filename)
+    for _ in range(300):  # more generations than the 8 bits of the entries
+        table.new_search()
+    store(table, (1, 2), depth=0)
+    table.flush()
+    for mmap_mode in [None, "r", "r+"]:
+        loaded = ArrayTranspositionTable(0)
+        loaded.from_file(filename, mmap_mode=mmap_mode)
+        assert loaded.generation == 300
+        loaded.prune_older_than(300)
+        assert len(loaded) == 1
+
+    table = pickle.loads(pickle.dumps(loaded))
+    assert table.generation == 300
+    table = pickle.loads(pickle.dumps(ArrayTranspositionTable(64)))
+    store(table, (1, 2), depth=0)
+    assert table.lookup(Nim(piles=(1, 2))) is not None